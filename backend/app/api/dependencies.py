@@ -0,0 +1,91 @@
+import logging
+from fastapi import Depends, Request
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.services.evaluation_scheduler import EvaluationScheduler
+from app.services.evaluation_service import EvaluationService
+from app.services.evaluation_jobs import EvaluationJobManager
+from app.services.engine_catalog import EngineCatalog
+from app.services.metadata_cache import MetadataCache
+from app.services.response_cache import ResponseCache
+from app.services.results_store import ResultsStore
+from app.utils.mindsdb_http import AsyncMindsDBClient
+
+logger = logging.getLogger(__name__)
+
+def get_mindsdb_http(request: Request) -> AsyncMindsDBClient:
+    """Return the app-lifetime async MindsDB client"""
+    client = getattr(request.app.state, "mindsdb", None)
+    if client is None:
+        # Startup hasn't run (e.g. the router is mounted on another app)
+        client = AsyncMindsDBClient()
+        request.app.state.mindsdb = client
+    return client
+
+def get_metadata_cache(request: Request) -> MetadataCache:
+    """Return the app-lifetime listing cache"""
+    cache = getattr(request.app.state, "metadata_cache", None)
+    if cache is None:
+        cache = MetadataCache()
+        request.app.state.metadata_cache = cache
+    return cache
+
+def get_engine_catalog(request: Request) -> EngineCatalog:
+    """Return the app-lifetime ML engine catalog"""
+    catalog = getattr(request.app.state, "engine_catalog", None)
+    if catalog is None:
+        catalog = EngineCatalog()
+        request.app.state.engine_catalog = catalog
+    return catalog
+
+def get_async_mindsdb_service(
+    client: AsyncMindsDBClient = Depends(get_mindsdb_http),
+    metadata_cache: MetadataCache = Depends(get_metadata_cache),
+    engine_catalog: EngineCatalog = Depends(get_engine_catalog),
+) -> AsyncMindsDBService:
+    """MindsDB service for async endpoints"""
+    return AsyncMindsDBService(client, metadata_cache, engine_catalog)
+
+def get_evaluation_scheduler(request: Request) -> EvaluationScheduler:
+    """Return the app-lifetime evaluation scheduler"""
+    scheduler = getattr(request.app.state, "evaluation_scheduler", None)
+    if scheduler is None:
+        scheduler = EvaluationScheduler()
+        request.app.state.evaluation_scheduler = scheduler
+    return scheduler
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """Return the app-lifetime evaluation response cache"""
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is None:
+        cache = ResponseCache()
+        request.app.state.response_cache = cache
+    return cache
+
+def get_results_store(request: Request) -> ResultsStore:
+    """Return the app-lifetime evaluation results store"""
+    store = getattr(request.app.state, "results_store", None)
+    if store is None:
+        store = ResultsStore()
+        request.app.state.results_store = store
+    return store
+
+def get_evaluation_service(
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+    scheduler: EvaluationScheduler = Depends(get_evaluation_scheduler),
+    cache: ResponseCache = Depends(get_response_cache),
+    results_store: ResultsStore = Depends(get_results_store),
+) -> EvaluationService:
+    """Campaign evaluation service for the evaluations endpoints"""
+    return EvaluationService(mindsdb_service, scheduler, cache, results_store)
+
+def get_evaluation_jobs(
+    request: Request,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service),
+) -> EvaluationJobManager:
+    """Return the app-lifetime background evaluation job manager"""
+    jobs = getattr(request.app.state, "evaluation_jobs", None)
+    if jobs is None:
+        jobs = EvaluationJobManager(evaluation_service)
+        jobs.start()
+        request.app.state.evaluation_jobs = jobs
+    return jobs
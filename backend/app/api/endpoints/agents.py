@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from app.models.agent import AgentCreate, Agent
-from app.services.mindsdb_service import MindsDBService
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Literal, Optional, Union
+from app.models.agent import AgentCreate, Agent, AgentImportResult
+from app.models.population import PopulationSpec
+from app.models.prompt import AgentPrompt, PromptSegmentInfo
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.services.agent_import import create_validated, import_agents
+from app.services.population import generate_population
+from app.services.prompts import agent_prompt_segments, estimate_tokens
+from app.config import AGENT_IMPORT_MAX_ROWS, PROMPT_LAYOUT
+from app.models.listing import ListQuery
+from app.api.responses import listing_response, model_response, page_response, parse_fields
+from app.api.dependencies import get_async_mindsdb_service
+import asyncio
 import logging
 
 router = APIRouter()
@@ -10,86 +19,153 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/", response_model=Agent)
-def create_agent(agent: AgentCreate):
+async def create_agent(agent: AgentCreate, mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service)):
     """Create a new agent"""
-    mindsdb_service = MindsDBService()
     try:
-        return mindsdb_service.create_agent(agent)
+        return await mindsdb_service.create_agent(agent)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create agent: {str(e)}")
 
+@router.post("/import", response_model=AgentImportResult)
+async def import_agents_file(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+):
+    """
+    Bulk-create agents from a CSV or JSONL request body (one AgentCreate per row).
+    The format comes from `format=` or the Content-Type; results are reported per row.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            format = "csv"
+        elif "json" in content_type:
+            format = "jsonl"
+        else:
+            raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=csv|jsonl")
+
+    body = await request.body()
+    logger.info(f"Received {format} agent import of {len(body)} bytes")
+    try:
+        result = await import_agents(mindsdb_service, body, format)
+        logger.info(f"Imported {result.created} of {result.total} agents")
+        return model_response(result, AgentImportResult)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to import agents: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to import agents: {str(e)}")
+
+@router.post("/generate", response_model=Union[AgentImportResult, List[AgentCreate]])
+async def generate_agents(
+    spec: PopulationSpec,
+    create: bool = False,
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+):
+    """
+    Sample a synthetic audience from a population spec. Returns the generated
+    agents, or with `create=true` creates them and returns per-agent results.
+    """
+    logger.info(f"Received request to generate {spec.size} agents")
+    # Creating is held to the import limit; only previews go up to PopulationSpec's ceiling
+    if create and spec.size > AGENT_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Can't create {spec.size} agents in one request, the limit is {AGENT_IMPORT_MAX_ROWS}",
+        )
+    # Off the event loop - six-figure populations take a noticeable fraction of a second
+    agents = await asyncio.to_thread(generate_population, spec)
+    if not create:
+        return model_response(agents, List[AgentCreate])
+    try:
+        result = await create_validated(mindsdb_service, list(enumerate(agents, start=1)), [], len(agents))
+        return model_response(result, AgentImportResult)
+    except Exception as e:
+        logger.error(f"Failed to create generated agents: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create generated agents: {str(e)}")
+
 @router.get("/", response_model=List[Agent])
-async def get_agents():
-    """Get all agents"""
+async def get_agents(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    ml_engine_id: Optional[str] = None,
+    location: Optional[str] = None,
+    min_price_sensitivity: Optional[int] = Query(None, ge=1, le=10),
+    max_price_sensitivity: Optional[int] = Query(None, ge=1, le=10),
+    min_brand_loyalty: Optional[int] = Query(None, ge=1, le=10),
+    max_brand_loyalty: Optional[int] = Query(None, ge=1, le=10),
+    min_tech_savviness: Optional[int] = Query(None, ge=1, le=10),
+    max_tech_savviness: Optional[int] = Query(None, ge=1, le=10),
+    fields: Optional[str] = None,
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+):
+    """
+    Get agents. Without parameters this returns the full (cached) listing;
+    otherwise filters and the `fields=` projection run in SQL against the
+    agents table and pages are chained through the X-Next-Cursor header
+    passed back as `after`.
+    """
     logger.info("Received request to get all agents")
+    ranges = {
+        "price_sensitivity": (min_price_sensitivity, max_price_sensitivity),
+        "brand_loyalty": (min_brand_loyalty, max_brand_loyalty),
+        "tech_savviness": (min_tech_savviness, max_tech_savviness),
+    }
+    list_query = ListQuery(
+        equals={k: v for k, v in {"ml_engine_id": ml_engine_id, "location": location}.items() if v is not None},
+        ranges={k: v for k, v in ranges.items() if v != (None, None)},
+        fields=parse_fields(fields),
+        after=after,
+        limit=limit,
+    )
     try:
-        mindsdb_service = MindsDBService()
-        
-        # Use SQL to list models (agents)
-        try:
-            query = "SHOW MODELS FROM marketing_agents;"
-            logger.info(f"Executing query: {query}")
-            
-            # Execute the query and get the raw response
-            query_result = mindsdb_service.client.query(query)
-            
-            # Log the raw response for debugging
-            logger.info(f"Raw query result: {query_result}")
-            
-            # Try to extract data from the query result
-            agents = []
-            
-            # Try different methods to extract data
-            try:
-                # Method 1: Try to iterate directly
-                for row in query_result:
-                    logger.info(f"Row: {row}")
-                    if hasattr(row, 'name'):
-                        # Create an agent with basic information
-                        agent_data = {
-                            "id": row.name,
-                            "name": row.name.replace('_', ' ').title(),
-                            "location": "Unknown",  # Required field
-                            "purchase_behaviors": [],  # Required field
-                            "purchase_frequency": "Unknown",  # Required field
-                            "brand_loyalty": 5,  # Required field
-                            "price_sensitivity": 5,  # Required field
-                            "tech_savviness": 5,  # Required field
-                            "ml_engine_id": "Unknown",  # Required field
-                            "created_at": datetime.now()
-                        }
-                        
-                        # Try to get more details about the agent
-                        try:
-                            model_query = f"DESCRIBE MODEL marketing_agents.{row.name};"
-                            model_details = mindsdb_service.client.query(model_query)
-                            
-                            # Try to extract agent attributes from model details
-                            for detail in model_details:
-                                if hasattr(detail, 'key') and hasattr(detail, 'value'):
-                                    if detail.key == 'agent_attributes':
-                                        try:
-                                            import json
-                                            attributes = json.loads(detail.value)
-                                            agent_data.update(attributes)
-                                        except:
-                                            pass
-                        except Exception as e:
-                            logger.warning(f"Error getting details for agent {row.name}: {str(e)}")
-                        
-                        agents.append(Agent(**agent_data))
-            except Exception as e:
-                logger.warning(f"Method 1 failed: {str(e)}")
-            
-            logger.info(f"Retrieved {len(agents)} agents")
-            return agents
-            
-        except Exception as e:
-            logger.error(f"Failed to get agents: {str(e)}")
-            
-            # If all methods fail, return empty list
-            return []
-                
+        if list_query.is_plain:
+            listing = await mindsdb_service.list_agents()
+            logger.info(f"Retrieved {len(listing.items)} agents")
+            return listing_response(listing, request)
+
+        rows, next_cursor = await mindsdb_service.query_agents(list_query)
+        logger.info(f"Retrieved {len(rows)} agents")
+        return page_response(rows, next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get agents: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get agents: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get agents: {str(e)}")
+
+@router.get("/{agent_id}/prompt", response_model=AgentPrompt)
+async def get_agent_prompt(
+    agent_id: str,
+    layout: Optional[Literal["cache_friendly", "legacy"]] = None,
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+):
+    """Preview an agent's prompt template with estimated token counts per segment"""
+    try:
+        agent = await mindsdb_service.get_agent(agent_id)
+    except Exception as e:
+        logger.error(f"Failed to get agent {agent_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get agent prompt: {str(e)}")
+
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+
+    segments = [
+        PromptSegmentInfo(name=segment.name, text=segment.text, cacheable=segment.cacheable, tokens=estimate_tokens(segment.text))
+        for segment in agent_prompt_segments(agent, layout)
+    ]
+    prefix_tokens = 0
+    for segment in segments:
+        if not segment.cacheable:
+            break
+        prefix_tokens += segment.tokens
+    return AgentPrompt(
+        agent_id=agent.id,
+        layout=layout or PROMPT_LAYOUT,
+        segments=segments,
+        total_tokens=sum(segment.tokens for segment in segments),
+        cacheable_prefix_tokens=prefix_tokens,
+    )
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+import asyncio
+import logging
+from app.models.analytics import AnalyticsSummary, ScoreBreakdown
+from app.services.results_store import ResultsStore
+from app.api.responses import FastJSONResponse
+from app.api.dependencies import get_results_store
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/summary", response_model=AnalyticsSummary)
+async def get_summary(campaign_id: Optional[str] = None, results_store: ResultsStore = Depends(get_results_store)):
+    """Evaluation totals and score statistics for a campaign, or across all campaigns"""
+    try:
+        return await asyncio.to_thread(results_store.summary, campaign_id)
+    except Exception as e:
+        logger.error(f"Failed to get analytics summary: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get analytics summary: {str(e)}")
+
+@router.get("/scores", response_model=ScoreBreakdown)
+async def get_scores(
+    group_by: str,
+    campaign_id: Optional[str] = None,
+    results_store: ResultsStore = Depends(get_results_store),
+):
+    """
+    Score statistics per agent attribute, e.g. mean engagement by income_level
+    for a campaign: `/api/analytics/scores?group_by=income_level&campaign_id=...`
+    """
+    try:
+        groups = await asyncio.to_thread(results_store.group_scores, group_by, campaign_id)
+        # Already the ScoreBreakdown shape; grouping by agent_id gives one group per agent
+        return FastJSONResponse({"campaign_id": campaign_id, "group_by": group_by, "groups": groups})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get score breakdown: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get score breakdown: {str(e)}")
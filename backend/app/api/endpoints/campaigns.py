@@ -1,20 +1,21 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
 import logging
 from app.models.campaign import CampaignCreate, Campaign
-from app.services.mindsdb_service import MindsDBService
-from datetime import datetime
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.models.listing import ListQuery
+from app.api.responses import listing_response, page_response, parse_fields
+from app.api.dependencies import get_async_mindsdb_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/", response_model=Campaign)
-async def create_campaign(campaign: CampaignCreate):
+async def create_campaign(campaign: CampaignCreate, mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service)):
     """Create a new marketing campaign"""
     logger.info(f"Received request to create campaign: {campaign.name}")
     try:
-        mindsdb_service = MindsDBService()
-        result = mindsdb_service.create_campaign(campaign)
+        result = await mindsdb_service.create_campaign(campaign)
         logger.info(f"Campaign created successfully: {result.id}")
         return result
     except ValueError as e:
@@ -25,67 +26,51 @@ async def create_campaign(campaign: CampaignCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create campaign: {str(e)}")
 
 @router.get("/", response_model=List[Campaign])
-async def get_campaigns():
-    """Get all campaigns"""
+async def get_campaigns(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    message_type: Optional[str] = None,
+    marketing_channel: Optional[str] = None,
+    fields: Optional[str] = None,
+    mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service),
+):
+    """
+    Get campaigns. Without parameters this returns the full (cached) listing;
+    otherwise filters and the `fields=` projection run in SQL and pages are
+    chained through the X-Next-Cursor header passed back as `after`.
+    """
     logger.info("Received request to get all campaigns")
+    list_query = ListQuery(
+        equals={k: v for k, v in {"message_type": message_type, "marketing_channel": marketing_channel}.items() if v is not None},
+        fields=parse_fields(fields),
+        after=after,
+        limit=limit,
+    )
     try:
-        mindsdb_service = MindsDBService()
-        
-        # Use SQL to list tables (campaigns)
-        try:
-            query = "SHOW TABLES FROM marketing_agents;"
-            logger.info(f"Executing query: {query}")
-            
-            # Execute the query and get the raw response
-            query_result = mindsdb_service.client.query(query)
-            
-            # Log the raw response for debugging
-            logger.info(f"Raw query result: {query_result}")
-            
-            # Try to extract data from the query result
-            campaigns = []
-            
-            # Try different methods to extract data
-            try:
-                # Method 1: Try to iterate directly
-                for row in query_result:
-                    logger.info(f"Row: {row}")
-                    if hasattr(row, 'name') and row.name.startswith('campaign_'):
-                        # Get campaign data
-                        try:
-                            campaign_query = f"SELECT * FROM marketing_agents.{row.name} LIMIT 1;"
-                            campaign_data = mindsdb_service.client.query(campaign_query)
-                            
-                            if hasattr(campaign_data, '__iter__'):
-                                for data in campaign_data:
-                                    campaigns.append(
-                                        Campaign(
-                                            id=row.name,
-                                            name=data.name if hasattr(data, 'name') else row.name.replace('campaign_', '').replace('_', ' ').title(),
-                                            description=data.description if hasattr(data, 'description') else "",
-                                            target_audience=data.target_audience if hasattr(data, 'target_audience') else "",
-                                            budget=data.budget if hasattr(data, 'budget') else "",
-                                            marketing_channel=data.marketing_channel if hasattr(data, 'marketing_channel') else "",
-                                            message_type=data.message_type if hasattr(data, 'message_type') else "informational",
-                                            content=data.content if hasattr(data, 'content') else "",
-                                            created_at=datetime.fromisoformat(data.created_at) if hasattr(data, 'created_at') else datetime.now()
-                                        )
-                                    )
-                                    break  # We only need the first row
-                        except Exception as e:
-                            logger.warning(f"Error getting data for campaign {row.name}: {str(e)}")
-            except Exception as e:
-                logger.warning(f"Method 1 failed: {str(e)}")
-            
-            logger.info(f"Retrieved {len(campaigns)} campaigns")
-            return campaigns
-            
-        except Exception as e:
-            logger.error(f"Failed to get campaigns: {str(e)}")
-            
-            # If all methods fail, return empty list
-            return []
-                
+        if list_query.is_plain:
+            listing = await mindsdb_service.list_campaigns()
+            logger.info(f"Retrieved {len(listing.items)} campaigns")
+            return listing_response(listing, request)
+
+        rows, next_cursor = await mindsdb_service.query_campaigns(list_query)
+        logger.info(f"Retrieved {len(rows)} campaigns")
+        return page_response(rows, next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get campaigns: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get campaigns: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get campaigns: {str(e)}")
+
+@router.get("/{campaign_id}", response_model=Campaign)
+async def get_campaign(campaign_id: str, mindsdb_service: AsyncMindsDBService = Depends(get_async_mindsdb_service)):
+    """Get a campaign by id"""
+    try:
+        campaign = await mindsdb_service.get_campaign(campaign_id)
+    except Exception as e:
+        logger.error(f"Failed to get campaign {campaign_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get campaign: {str(e)}")
+
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
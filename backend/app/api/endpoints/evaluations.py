@@ -0,0 +1,131 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, List, Literal, Optional
+import logging
+from datetime import datetime
+from app.models.evaluation import EvaluationAggregate, EvaluationJob, EvaluationRequest, EvaluationResult
+from app.services.evaluation_jobs import EvaluationJobManager
+from app.services.evaluation_service import EvaluationService, average_score
+from app.services.response_cache import ResponseCache
+from app.api.responses import model_response
+from app.utils.serialization import dumps
+from app.api.dependencies import get_evaluation_jobs, get_evaluation_service, get_response_cache
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _encode_event(event: str, data: Any, format: str) -> str:
+    if format == "sse":
+        return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+    return dumps({"event": event, "data": data}).decode() + "\n"
+
+@router.post("/", response_model=EvaluationResult)
+async def evaluate_campaign(request: EvaluationRequest, evaluation_service: EvaluationService = Depends(get_evaluation_service)):
+    """Evaluate a campaign against a set of agents"""
+    logger.info(f"Received request to evaluate campaign: {request.campaign_id}")
+    try:
+        result = await evaluation_service.evaluate_campaign(request)
+        logger.info(f"Evaluated campaign {result.campaign_id} against {len(result.evaluations)} agents")
+        return model_response(result, EvaluationResult)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to evaluate campaign: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate campaign: {str(e)}")
+
+@router.post("/stream")
+async def stream_evaluation(
+    request: EvaluationRequest,
+    http_request: Request,
+    format: Optional[Literal["ndjson", "sse"]] = None,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service),
+):
+    """
+    Evaluate a campaign and stream each agent's result as soon as it arrives,
+    followed by the updated aggregates. Uses Server-Sent Events when requested
+    via `format=sse` or `Accept: text/event-stream`, NDJSON otherwise.
+    """
+    logger.info(f"Received request to stream evaluation of campaign: {request.campaign_id}")
+    if format is None:
+        format = "sse" if "text/event-stream" in http_request.headers.get("accept", "") else "ndjson"
+
+    # Query agents one at a time unless the caller asked for bigger batches,
+    # so the first result only waits for a single model call
+    batch_size = None if "batch_size" in request.model_fields_set else 1
+
+    try:
+        run = await evaluation_service.prepare(request, batch_size=batch_size)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to start evaluation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate campaign: {str(e)}")
+
+    async def events():
+        aggregate = EvaluationAggregate(campaign_id=run.campaign.id, total=run.total)
+        async for evaluation in evaluation_service.run(run):
+            aggregate.add(evaluation)
+            yield _encode_event("evaluation", evaluation.dict(), format)
+            yield _encode_event("aggregate", aggregate.dict(), format)
+        yield _encode_event("done", aggregate.dict(), format)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/cache")
+async def get_cache_stats(cache: ResponseCache = Depends(get_response_cache)):
+    """Get response cache hit/miss counters"""
+    return cache.stats()
+
+@router.post("/jobs", response_model=EvaluationJob, status_code=202)
+async def create_evaluation_job(request: EvaluationRequest, jobs: EvaluationJobManager = Depends(get_evaluation_jobs)):
+    """
+    Evaluate a campaign in the background. Returns the job right away; poll
+    `/jobs/{job_id}` for progress and fetch `/jobs/{job_id}/results` when done.
+    """
+    logger.info(f"Received request to queue evaluation of campaign: {request.campaign_id}")
+    try:
+        return await jobs.submit(request)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to queue evaluation job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue evaluation job: {str(e)}")
+
+@router.get("/jobs", response_model=List[EvaluationJob])
+async def list_evaluation_jobs(jobs: EvaluationJobManager = Depends(get_evaluation_jobs)):
+    """List evaluation jobs, newest first"""
+    return model_response(await jobs.list(), List[EvaluationJob])
+
+@router.get("/jobs/{job_id}", response_model=EvaluationJob)
+async def get_evaluation_job(job_id: str, jobs: EvaluationJobManager = Depends(get_evaluation_jobs)):
+    """Get a job's status and progress, with throughput and ETA while it runs"""
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
+
+@router.get("/jobs/{job_id}/results", response_model=EvaluationResult)
+async def get_evaluation_job_results(job_id: str, jobs: EvaluationJobManager = Depends(get_evaluation_jobs)):
+    """Get the results a job has checkpointed so far"""
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    evaluations = await jobs.results(job_id)
+    return model_response(EvaluationResult(
+        campaign_id=job.campaign_id,
+        evaluations=evaluations,
+        average_score=average_score(evaluations),
+        created_at=job.finished_at or datetime.now(),
+    ), EvaluationResult)
+
+@router.delete("/jobs/{job_id}", response_model=EvaluationJob)
+async def cancel_evaluation_job(job_id: str, jobs: EvaluationJobManager = Depends(get_evaluation_jobs)):
+    """Cancel a queued or running job, keeping its results so far"""
+    job = await jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Evaluation job not found")
+    return job
@@ -0,0 +1,43 @@
+from typing import Any, Dict, List, Optional
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from app.services.metadata_cache import CachedListing
+from app.utils.serialization import dump_models, dumps
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for plain dict/list payloads"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def model_response(content: Any, model_type: Any, status_code: int = 200) -> Response:
+    """
+    Return models the service built itself, serialized in one pass by
+    pydantic-core. Returning a Response skips FastAPI's re-validation against
+    the route's response_model, which stays for the OpenAPI schema.
+    """
+    return Response(content=dump_models(content, model_type), media_type="application/json", status_code=status_code)
+
+def listing_response(listing: CachedListing, request: Request) -> Response:
+    """
+    Return a cached listing as JSON with its ETag, or 304 Not Modified when
+    the client already holds the current version.
+    """
+    headers = {"ETag": listing.etag, "Cache-Control": "no-cache"}
+    # Compression proxies may weaken the tag, which still matches for GET
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if listing.etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return Response(content=listing.body, media_type="application/json", headers=headers)
+
+def page_response(rows: List[Dict[str, Any]], next_cursor: Optional[str]) -> Response:
+    """Return one page of rows, with the next page's cursor in X-Next-Cursor"""
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return Response(content=dumps(rows), media_type="application/json", headers=headers)
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated `fields=` projection"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
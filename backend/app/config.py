@@ -7,4 +7,75 @@ load_dotenv()
 # MindsDB configuration
 MINDSDB_HOST = os.getenv("MINDSDB_HOST", "cloud.mindsdb.com")
 MINDSDB_USER = os.getenv("MINDSDB_USER", "your_mindsdb_user")
-MINDSDB_PASSWORD = os.getenv("MINDSDB_PASSWORD", "your_mindsdb_password") 
\ No newline at end of file
+MINDSDB_PASSWORD = os.getenv("MINDSDB_PASSWORD", "your_mindsdb_password")
+
+# MindsDB HTTP SQL API configuration (used by the async service)
+MINDSDB_HTTP_MAX_CONNECTIONS = int(os.getenv("MINDSDB_HTTP_MAX_CONNECTIONS", "100"))
+MINDSDB_HTTP_TIMEOUT = float(os.getenv("MINDSDB_HTTP_TIMEOUT", "60"))
+
+# MindsDB circuit breaker: consecutive connection failures before calls fail
+# fast, and the first/maximum wait before a probe is let through (seconds)
+MINDSDB_BREAKER_FAILURE_THRESHOLD = int(os.getenv("MINDSDB_BREAKER_FAILURE_THRESHOLD", "5"))
+MINDSDB_BREAKER_RESET_TIMEOUT = float(os.getenv("MINDSDB_BREAKER_RESET_TIMEOUT", "1"))
+MINDSDB_BREAKER_MAX_RESET_TIMEOUT = float(os.getenv("MINDSDB_BREAKER_MAX_RESET_TIMEOUT", "60"))
+
+# Background MindsDB setup at startup: retry delays while MindsDB is unreachable (seconds)
+MINDSDB_SETUP_RETRY_BASE_DELAY = float(os.getenv("MINDSDB_SETUP_RETRY_BASE_DELAY", "1"))
+MINDSDB_SETUP_RETRY_MAX_DELAY = float(os.getenv("MINDSDB_SETUP_RETRY_MAX_DELAY", "30"))
+
+# Evaluation scheduler defaults (per engine, overridable on each MLEngine)
+EVALUATION_DEFAULT_CONCURRENCY = int(os.getenv("EVALUATION_DEFAULT_CONCURRENCY", "4"))
+EVALUATION_DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("EVALUATION_DEFAULT_REQUESTS_PER_MINUTE", "60"))
+EVALUATION_MAX_RETRIES = int(os.getenv("EVALUATION_MAX_RETRIES", "3"))
+EVALUATION_RETRY_BASE_DELAY = float(os.getenv("EVALUATION_RETRY_BASE_DELAY", "1"))
+EVALUATION_RETRY_MAX_DELAY = float(os.getenv("EVALUATION_RETRY_MAX_DELAY", "30"))
+
+# Local storage for caches, results and job checkpoints
+DATA_DIR = os.getenv("YAVER_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data"))
+
+# Evaluation response cache
+RESPONSE_CACHE_MEMORY_SIZE = int(os.getenv("RESPONSE_CACHE_MEMORY_SIZE", "10000"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000000"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Background evaluation jobs: jobs processed at once (each still goes through
+# the scheduler's per-engine limits), checkpointed under DATA_DIR
+EVALUATION_JOB_WORKERS = int(os.getenv("EVALUATION_JOB_WORKERS", "2"))
+
+# Evaluation results store behind /api/analytics: scores at or above the
+# threshold count towards the engagement rate
+ENGAGEMENT_SCORE_THRESHOLD = int(os.getenv("ENGAGEMENT_SCORE_THRESHOLD", "7"))
+
+# ML engine catalog: one descriptor file per engine, reconciled with MindsDB
+# in the background every ENGINE_CATALOG_SYNC_INTERVAL seconds (0 syncs once at startup)
+ENGINES_DIR = os.getenv("ENGINES_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "engines"))
+ENGINE_CATALOG_SYNC_INTERVAL = float(os.getenv("ENGINE_CATALOG_SYNC_INTERVAL", "300"))
+
+# Response compression: bodies of at least COMPRESSION_MIN_SIZE bytes are sent
+# brotli-compressed (when the brotli package is installed) or gzipped
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_COMPRESSION_LEVEL = int(os.getenv("GZIP_COMPRESSION_LEVEL", "6"))
+BROTLI_COMPRESSION_QUALITY = int(os.getenv("BROTLI_COMPRESSION_QUALITY", "4"))
+
+# Read-through cache for agent/campaign/engine listings (seconds)
+METADATA_CACHE_TTL = float(os.getenv("METADATA_CACHE_TTL", "30"))
+
+# Bulk agent import
+AGENT_IMPORT_CONCURRENCY = int(os.getenv("AGENT_IMPORT_CONCURRENCY", "8"))  # CREATE MODEL statements in flight
+AGENT_IMPORT_INSERT_BATCH = int(os.getenv("AGENT_IMPORT_INSERT_BATCH", "500"))  # Profile rows per INSERT
+AGENT_IMPORT_MAX_ROWS = int(os.getenv("AGENT_IMPORT_MAX_ROWS", "10000"))
+
+# Query tracing: share of requests whose MindsDB statements are traced and logged,
+# whether clients may force a trace with X-Debug-Trace (dev only), and the slow statement threshold
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+TRACE_DEBUG_HEADER = os.getenv("TRACE_DEBUG_HEADER", "false").lower() in ("1", "true", "yes")
+TRACE_SLOW_QUERY_SECONDS = float(os.getenv("TRACE_SLOW_QUERY_SECONDS", "5"))
+TRACE_MAX_STATEMENT_LENGTH = int(os.getenv("TRACE_MAX_STATEMENT_LENGTH", "500"))
+
+# Agent prompt template layout for new agent models: "cache_friendly" puts the
+# shared instructions first so provider prompt caches hit, "legacy" keeps the old order
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "cache_friendly")
+
+# What new agent models are asked to answer with: "json" (score, sentiment and
+# reasons, parsed without regexes) or "text" (prose ending in a 1-10 rating)
+AGENT_RESPONSE_FORMAT = os.getenv("AGENT_RESPONSE_FORMAT", "json")
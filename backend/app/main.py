@@ -1,9 +1,21 @@
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import agents, campaigns, ml_engines
-from app.scripts.setup_mindsdb import setup_mindsdb
-import asyncio
+from app.api.endpoints import agents, campaigns, ml_engines, evaluations, analytics
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.services.mindsdb_setup import MindsDBSetup
+from app.services.evaluation_scheduler import EvaluationScheduler
+from app.services.evaluation_service import EvaluationService
+from app.services.evaluation_jobs import EvaluationJobManager
+from app.services.engine_catalog import EngineCatalog
+from app.services.response_cache import ResponseCache
+from app.services.results_store import ResultsStore
+from app.services.metadata_cache import MetadataCache
+from app.utils.mindsdb_http import AsyncMindsDBClient
+from app.utils.metrics import MetricsMiddleware, render_metrics
+from app.utils.tracing import TracingMiddleware
+from app.utils.compression import CompressionMiddleware
 
 app = FastAPI(title="Marketing Campaign Evaluation API")
 
@@ -18,28 +30,96 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Query-Trace"],
 )
 
+# Request latency and in-flight metrics for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Sampled traces of the MindsDB statements behind each request
+app.add_middleware(TracingMiddleware)
+
+# Brotli/gzip for large bodies; outermost, so everything above sees uncompressed responses
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
 app.include_router(campaigns.router, prefix="/api/campaigns", tags=["campaigns"])
 app.include_router(ml_engines.router, prefix="/api/ml-engines", tags=["ml_engines"])
+app.include_router(evaluations.router, prefix="/api/evaluations", tags=["evaluations"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
 @app.get("/api/hello")
 async def hello():
     return {"message": "Hello from the Marketing Campaign Evaluation API!"}
 
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: MindsDB setup has completed, MindsDB is reachable and its circuit isn't open"""
+    setup = getattr(app.state, "mindsdb_setup", None)
+    if setup is None:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    status = setup.status()
+    ready = status["setup_complete"] and status["connected"] and status["circuit"] != "open"
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "mindsdb": status},
+        status_code=200 if ready else 503,
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.on_event("startup")
 async def startup_event():
-    # Run MindsDB setup in a separate thread to avoid blocking the startup
-    loop = asyncio.get_event_loop()
-    try:
-        logger.info("Setting up MindsDB...")
-        await loop.run_in_executor(None, setup_mindsdb)
-        logger.info("MindsDB setup completed")
-    except Exception as e:
-        logger.error(f"Error setting up MindsDB: {str(e)}")
-        logger.info("Continuing without initial MindsDB setup - will try to connect when needed")
+    # The MindsDB client lives for the whole app and is shared by all requests;
+    # one already set on app.state (e.g. by a benchmark) is kept
+    if getattr(app.state, "mindsdb", None) is None:
+        app.state.mindsdb = AsyncMindsDBClient()
+    app.state.evaluation_scheduler = EvaluationScheduler()
+    app.state.response_cache = ResponseCache()
+    app.state.results_store = ResultsStore()
+    app.state.metadata_cache = MetadataCache()
+    app.state.engine_catalog = EngineCatalog()
+    mindsdb_service = AsyncMindsDBService(app.state.mindsdb, app.state.metadata_cache, app.state.engine_catalog)
+    app.state.evaluation_jobs = EvaluationJobManager(EvaluationService(
+        mindsdb_service,
+        app.state.evaluation_scheduler,
+        app.state.response_cache,
+        app.state.results_store,
+    ))
+
+    # Engine rate limits survive restarts through the catalog
+    for engine in app.state.engine_catalog.list():
+        app.state.evaluation_scheduler.configure_from_engine(engine)
+
+    def on_ready():
+        app.state.evaluation_jobs.start()
+        app.state.engine_catalog.start_sync(mindsdb_service.sync_ml_engines)
+
+    # Set up MindsDB in the background so the app starts serving right away;
+    # evaluation jobs a previous process left unfinished resume and the engine
+    # catalog starts syncing once it's done
+    app.state.mindsdb_setup = MindsDBSetup(app.state.mindsdb)
+    app.state.mindsdb_setup.start(on_ready=on_ready)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Background work stops first so job results are checkpointed while MindsDB is still reachable
+    await app.state.mindsdb_setup.close()
+    await app.state.evaluation_jobs.close()
+    await app.state.engine_catalog.close()
+    await app.state.mindsdb.close()
+    app.state.evaluation_scheduler.close()
+    app.state.response_cache.close()
+    app.state.results_store.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -55,6 +55,8 @@ class AgentBase(BaseModel):
     
     @validator('interests', 'purchase_behaviors')
     def check_list_items(cls, v):
+        if v is None:
+            return v  # interests is optional
         if not all(isinstance(item, str) and len(item.strip()) > 0 for item in v):
             raise ValueError('All items must be non-empty strings')
         return v
@@ -71,4 +73,17 @@ class Agent(AgentBase):
         orm_mode = True
 
 class AgentResponse(Agent):
-    pass 
\ No newline at end of file
+    pass
+
+class AgentImportRow(BaseModel):
+    """Outcome of one row of a bulk agent import"""
+    row: int  # 1-based data row in the upload
+    id: Optional[str] = None
+    name: Optional[str] = None
+    error: Optional[str] = None
+
+class AgentImportResult(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[AgentImportRow]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class AnalyticsSummary(BaseModel):
+    """Totals over the stored evaluations of one campaign, or of all campaigns"""
+    campaign_id: Optional[str] = None
+    evaluations: int
+    scored: int
+    failed: int
+    cached: int
+    campaigns: int
+    agents: int
+    average_score: Optional[float] = None
+    engagement_rate: Optional[float] = None  # Share of scores at or above ENGAGEMENT_SCORE_THRESHOLD
+    average_latency_ms: Optional[float] = None
+    score_distribution: Dict[int, int] = Field(default_factory=dict)
+
+class ScoreGroup(BaseModel):
+    value: Optional[str] = None  # None collects evaluations without the attribute
+    evaluations: int
+    scored: int
+    failed: int
+    average_score: Optional[float] = None
+    score_std: Optional[float] = None
+    engagement_rate: Optional[float] = None
+    average_latency_ms: Optional[float] = None
+
+class ScoreBreakdown(BaseModel):
+    campaign_id: Optional[str] = None
+    group_by: str
+    groups: List[ScoreGroup]
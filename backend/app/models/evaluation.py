@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from datetime import datetime
+
+class EvaluationRequest(BaseModel):
+    campaign_id: str
+    agent_ids: Optional[List[str]] = None  # Evaluate against all agents when omitted
+    batch_size: int = Field(25, ge=1, le=500)  # Agents per batched MindsDB prediction
+    priority: Literal["interactive", "bulk"] = "interactive"  # Interactive runs go ahead of bulk runs
+    bypass_cache: bool = False  # Always query the models, but still store fresh responses
+
+class StructuredResponse(BaseModel):
+    """What agent models created with the "json" response format answer with"""
+    score: int = Field(..., ge=1, le=10)
+    sentiment: Literal["positive", "neutral", "negative"]
+    reasons: List[str] = Field(default_factory=list)
+
+class AgentEvaluation(BaseModel):
+    agent_id: str
+    ml_engine_id: Optional[str] = None
+    response: Optional[str] = None
+    score: Optional[int] = Field(None, ge=1, le=10)
+    sentiment: Optional[str] = None  # Only from structured responses
+    reasons: Optional[List[str]] = None
+    error: Optional[str] = None
+    cached: bool = False
+    latency_ms: Optional[float] = None  # Time for the batched prediction this came from
+
+class EvaluationResult(BaseModel):
+    campaign_id: str
+    evaluations: List[AgentEvaluation]
+    average_score: Optional[float] = None
+    created_at: datetime
+
+class EvaluationAggregate(BaseModel):
+    """Running totals emitted while an evaluation streams"""
+    campaign_id: str
+    total: int
+    completed: int = 0
+    failed: int = 0
+    cached: int = 0
+    scored: int = 0
+    average_score: Optional[float] = None
+    score_distribution: Dict[int, int] = Field(default_factory=dict)
+
+    def add(self, evaluation: AgentEvaluation):
+        self.completed += 1
+        if evaluation.error is not None:
+            self.failed += 1
+        if evaluation.cached:
+            self.cached += 1
+        if evaluation.score is not None:
+            total_score = (self.average_score or 0) * self.scored + evaluation.score
+            self.scored += 1
+            self.average_score = total_score / self.scored
+            self.score_distribution[evaluation.score] = self.score_distribution.get(evaluation.score, 0) + 1
+
+class EvaluationJob(BaseModel):
+    """A background evaluation and its progress"""
+    id: str
+    campaign_id: str
+    status: Literal["queued", "running", "completed", "failed", "cancelled"]
+    total: int
+    completed: int = 0  # Agents with a checkpointed result, including failures
+    failed: int = 0
+    average_score: Optional[float] = None
+    throughput: Optional[float] = None  # Agents per second since the job last (re)started
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
+
+class ListQuery(BaseModel):
+    """Filters, projection and keyset pagination for a list endpoint"""
+    equals: Dict[str, str] = Field(default_factory=dict)  # column = value
+    ranges: Dict[str, Tuple[Optional[int], Optional[int]]] = Field(default_factory=dict)  # column BETWEEN min AND max
+    fields: Optional[List[str]] = None  # Columns to return, all when omitted
+    after: Optional[str] = None  # Cursor from the previous page's X-Next-Cursor header
+    limit: Optional[int] = Field(None, ge=1, le=1000)
+
+    @property
+    def is_plain(self) -> bool:
+        """True when the query asks for the full, unfiltered listing"""
+        return not (self.equals or self.ranges or self.fields or self.after or self.limit)
@@ -8,6 +8,8 @@ class MLEngineBase(BaseModel):
     api_key: str
     model_version: Optional[str] = None
     description: Optional[str] = None
+    max_concurrency: Optional[int] = Field(None, ge=1)  # Parallel evaluation calls, defaults from config
+    requests_per_minute: Optional[int] = Field(None, ge=1)  # Provider rate limit, defaults from config
     
     @validator('name')
     def name_must_be_valid(cls, v):
@@ -0,0 +1,96 @@
+from pydantic import BaseModel, Field, validator, root_validator
+from typing import Dict, Literal, Optional
+from app.models.agent import CommunicationPreference, EducationLevel, Gender, PurchaseFrequency
+
+class NumericSpec(BaseModel):
+    """
+    Distribution for an integer attribute. Samples are rounded and clipped to
+    [low, high]; `beta` is scaled onto the range, so a > b skews high.
+    """
+    distribution: Literal["uniform", "normal", "beta"] = "uniform"
+    low: int = 1
+    high: int = 10
+    mean: Optional[float] = None  # normal, defaults to the middle of the range
+    std: Optional[float] = Field(None, gt=0)  # normal, defaults to a sixth of the range
+    a: float = Field(2.0, gt=0)  # beta
+    b: float = Field(2.0, gt=0)  # beta
+
+    @root_validator(skip_on_failure=True)
+    def check_range(cls, values):
+        if values["low"] > values["high"]:
+            raise ValueError('low must not be greater than high')
+        return values
+
+class CategoricalSpec(BaseModel):
+    """One value per agent, drawn with the given relative weights"""
+    weights: Dict[str, float] = Field(..., min_items=1)
+
+    @validator('weights')
+    def check_weights(cls, v):
+        if any(weight < 0 for weight in v.values()) or sum(v.values()) <= 0:
+            raise ValueError('Weights must be non-negative with a positive total')
+        if any(not value.strip() for value in v):
+            raise ValueError('Values must be non-empty strings')
+        return v
+
+class MultiLabelSpec(CategoricalSpec):
+    """Between min_items and max_items distinct values per agent, drawn by weight"""
+    min_items: int = Field(1, ge=0)
+    max_items: int = Field(3, ge=1)
+
+    @root_validator(skip_on_failure=True)
+    def check_items(cls, values):
+        if values["min_items"] > values["max_items"]:
+            raise ValueError('min_items must not be greater than max_items')
+        positive = sum(weight > 0 for weight in values["weights"].values())
+        if values["min_items"] > positive:
+            raise ValueError('min_items is larger than the number of values with a positive weight')
+        return values
+
+def _check_enum_values(spec: Optional[CategoricalSpec], enum, field: str):
+    if spec is not None:
+        unknown = set(spec.weights) - {member.value for member in enum}
+        if unknown:
+            raise ValueError(f"Unknown {field} values: {', '.join(sorted(unknown))}")
+
+class PopulationSpec(BaseModel):
+    """Declarative description of a synthetic audience built from AgentBase fields"""
+    size: int = Field(..., ge=1, le=1_000_000)
+    seed: Optional[int] = None  # Same spec and seed give the same population
+    ml_engine_id: str
+    name_prefix: str = "Persona"
+
+    age: Optional[NumericSpec] = None
+    gender: Optional[CategoricalSpec] = None
+    occupation: Optional[CategoricalSpec] = None
+    income_level: Optional[CategoricalSpec] = None
+    education_level: Optional[CategoricalSpec] = None
+    location: CategoricalSpec
+    interests: Optional[MultiLabelSpec] = None
+    personality_traits: Optional[MultiLabelSpec] = None
+    social_media_usage: Optional[MultiLabelSpec] = None
+    purchase_behaviors: MultiLabelSpec = MultiLabelSpec(
+        weights={"online_shopping": 1, "in_store": 1, "deal_seeking": 1, "subscriptions": 0.5}, max_items=2
+    )
+    purchase_frequency: CategoricalSpec = CategoricalSpec(weights={member.value: 1 for member in PurchaseFrequency})
+    communication_preferences: MultiLabelSpec = MultiLabelSpec(
+        weights={member.value: 1 for member in CommunicationPreference}, max_items=2
+    )
+    brand_loyalty: NumericSpec = NumericSpec()
+    price_sensitivity: NumericSpec = NumericSpec()
+    tech_savviness: NumericSpec = NumericSpec()
+
+    @root_validator(skip_on_failure=True)
+    def check_enums_and_sliders(cls, values):
+        _check_enum_values(values.get("gender"), Gender, "gender")
+        _check_enum_values(values.get("education_level"), EducationLevel, "education_level")
+        _check_enum_values(values["purchase_frequency"], PurchaseFrequency, "purchase_frequency")
+        _check_enum_values(values["communication_preferences"], CommunicationPreference, "communication_preferences")
+        if any(len(value) < 2 for value in values["location"].weights):
+            raise ValueError('location values must be at least 2 characters')
+        for slider in ("brand_loyalty", "price_sensitivity", "tech_savviness"):
+            if values[slider].low < 1 or values[slider].high > 10:
+                raise ValueError(f"{slider} must stay within 1-10")
+        if values["communication_preferences"].min_items < 1 or values["purchase_behaviors"].min_items < 1:
+            raise ValueError('communication_preferences and purchase_behaviors need min_items of at least 1')
+        return values
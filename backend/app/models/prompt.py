@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+class PromptSegmentInfo(BaseModel):
+    name: str
+    text: str
+    cacheable: bool  # Same for every evaluation sharing this prefix
+    tokens: int  # Estimated
+
+class AgentPrompt(BaseModel):
+    """An agent's rendered prompt template, split into cacheable segments"""
+    agent_id: str
+    layout: str
+    segments: List[PromptSegmentInfo]
+    total_tokens: int
+    cacheable_prefix_tokens: int  # Tokens before the first segment that varies per evaluation
@@ -2,8 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from app.models.agent import Agent, AgentCreate, AgentResponse
 from app.utils.mindsdb_client import get_mindsdb_client
+from app.services.mindsdb_queries import agent_from_row, agents_from_rows
 import json
 import uuid
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/api/agents",
@@ -67,17 +71,12 @@ async def get_agents():
         query = "SELECT * FROM marketing_agents.agents"
         result = project.query(query)
         
-        rows = result.fetch()
+        rows = _records(result.fetch())
         
-        # Convert JSON strings back to lists for each agent
-        agents = []
-        for row in rows:
-            row['interests'] = json.loads(row['interests'])
-            row['purchase_behaviors'] = json.loads(row['purchase_behaviors'])
-            row['communication_preferences'] = json.loads(row['communication_preferences'])
-            if row.get('social_media_usage'):
-                row['social_media_usage'] = json.loads(row['social_media_usage'])
-            agents.append(row)
+        # Decode and validate all rows in one pass; bad rows are skipped, not fatal
+        agents, invalid = agents_from_rows(rows)
+        for agent_id, error in invalid:
+            logger.warning(f"Skipping agent {agent_id}: {error}")
         
         return agents
     
@@ -98,22 +97,19 @@ async def get_agent(agent_id: str):
         query = f"SELECT * FROM marketing_agents.agents WHERE id = '{agent_id}'"
         result = project.query(query)
         
-        rows = result.fetch()
+        rows = _records(result.fetch())
         if not rows:
             raise HTTPException(status_code=404, detail="Agent not found")
         
-        row = rows[0]
-        
-        # Convert JSON strings back to lists
-        row['interests'] = json.loads(row['interests'])
-        row['purchase_behaviors'] = json.loads(row['purchase_behaviors'])
-        row['communication_preferences'] = json.loads(row['communication_preferences'])
-        if row.get('social_media_usage'):
-            row['social_media_usage'] = json.loads(row['social_media_usage'])
-        
-        return row
+        return agent_from_row(rows[0])
     
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get agent: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to get agent: {str(e)}")
+
+def _records(rows):
+    # The SDK returns a DataFrame; NULLs become None rather than NaN
+    if hasattr(rows, "to_dict"):
+        return rows.astype(object).where(rows.notna(), None).to_dict("records")
+    return list(rows)
@@ -0,0 +1,71 @@
+import logging
+from app.services import mindsdb_queries as queries
+from app.services.mindsdb_service import MindsDBService
+
+logger = logging.getLogger(__name__)
+
+def migrate_campaigns(drop_legacy_tables: bool = False) -> int:
+    """
+    Fold legacy campaign_* tables into the consolidated campaigns table.
+    Returns the number of campaigns migrated.
+    """
+    service = MindsDBService()
+    service.query(queries.create_campaigns_table_query())
+
+    existing = service.query(f"SELECT id FROM {queries.CAMPAIGNS_TABLE};")
+    existing_ids = set(existing["id"]) if existing is not None and "id" in existing.columns else set()
+
+    tables = service.query(f"SHOW TABLES FROM {queries.PROJECT};")
+    if tables is None or tables.empty:
+        logger.info("No tables found - nothing to migrate")
+        return 0
+
+    migrated = 0
+    for table in tables.iloc[:, 0]:
+        if not isinstance(table, str) or not table.startswith("campaign_"):
+            continue
+
+        if table in existing_ids:
+            logger.info(f"Campaign {table} already migrated")
+        else:
+            try:
+                rows = service.query(f"SELECT * FROM {queries.PROJECT}.{table} LIMIT 1;")
+                if rows is None or rows.empty:
+                    logger.warning(f"Campaign table {table} is empty - skipping")
+                    continue
+                row = {k.lower(): v for k, v in rows.iloc[0].to_dict().items()}
+                campaign = queries.campaign_from_row({**row, "id": table})
+                service.query(queries.insert_campaign_query(campaign))
+                migrated += 1
+                logger.info(f"Migrated campaign {table}")
+            except Exception as e:
+                logger.error(f"Error migrating campaign {table}: {str(e)}")
+                continue
+
+        if drop_legacy_tables:
+            try:
+                # Only drop a legacy table once its campaign is confirmed in the campaigns table
+                stored = service.query(queries.select_campaign_query(table))
+                if stored is None or stored.empty:
+                    logger.warning(f"Campaign {table} not found in {queries.CAMPAIGNS_TABLE} - keeping legacy table")
+                    continue
+                service.query(f"DROP TABLE {queries.PROJECT}.{table};")
+                logger.info(f"Dropped legacy table {table}")
+            except Exception as e:
+                logger.error(f"Error dropping legacy table {table}: {str(e)}")
+                continue
+
+    logger.info(f"Migrated {migrated} campaigns")
+    return migrated
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold campaign_* tables into the campaigns table")
+    parser.add_argument("--drop", action="store_true", help="drop the legacy tables after migrating them")
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+
+    migrate_campaigns(drop_legacy_tables=args.drop)
@@ -0,0 +1,128 @@
+import io
+import csv
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+from pydantic import ValidationError
+from app.config import AGENT_IMPORT_CONCURRENCY, AGENT_IMPORT_INSERT_BATCH, AGENT_IMPORT_MAX_ROWS
+from app.models.agent import AgentCreate, AgentImportResult, AgentImportRow
+from app.services import mindsdb_queries as queries
+from app.services.async_mindsdb_service import AsyncMindsDBService
+
+logger = logging.getLogger(__name__)
+
+# AgentCreate fields that hold lists or objects; in CSV cells lists are
+# either JSON arrays or ';'-separated values and objects are JSON
+LIST_FIELDS = ("interests", "personality_traits", "purchase_behaviors", "communication_preferences", "social_media_usage")
+OBJECT_FIELDS = ("buying_preferences",)
+
+def _csv_value(field: str, value: str) -> Any:
+    if field in OBJECT_FIELDS or (field in LIST_FIELDS and value.startswith("[")):
+        return json.loads(value)
+    if field in LIST_FIELDS:
+        return [item.strip() for item in value.split(";") if item.strip()]
+    return value
+
+def parse_rows(body: bytes, format: str) -> List[Dict[str, Any]]:
+    """
+    Decode an upload into one dict per data row. Rows that can't be decoded
+    are returned as an "error" entry so they're reported with the others.
+    """
+    text = body.decode("utf-8-sig")
+    rows = []
+    if format == "csv":
+        for record in csv.DictReader(io.StringIO(text)):
+            try:
+                # Empty cells fall back to the field defaults
+                rows.append({
+                    field: _csv_value(field, value.strip())
+                    for field, value in record.items()
+                    if field and value is not None and value.strip()
+                })
+            except ValueError as e:
+                rows.append({"error": f"Invalid JSON cell: {str(e)}"})
+    else:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                rows.append(record if isinstance(record, dict) else {"error": "Row is not a JSON object"})
+            except ValueError as e:
+                rows.append({"error": f"Invalid JSON: {str(e)}"})
+    return rows
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
+def validate_rows(rows: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, AgentCreate]], List[AgentImportRow]]:
+    """Validate every row up front; returns the valid agents with their row numbers and the failures"""
+    valid, failed = [], []
+    seen = {}
+    for number, row in enumerate(rows, start=1):
+        if "error" in row and len(row) == 1:
+            failed.append(AgentImportRow(row=number, error=row["error"]))
+            continue
+        try:
+            agent = AgentCreate(**row)
+        except Exception as e:
+            failed.append(AgentImportRow(row=number, name=row.get("name"), error=_error_message(e)))
+            continue
+
+        # Agent ids come from the name, so a repeated name would collide
+        agent_id = queries.format_name(agent.name)
+        if agent_id in seen:
+            failed.append(AgentImportRow(
+                row=number, name=agent.name, error=f"Duplicate agent name (same as row {seen[agent_id]})"
+            ))
+            continue
+        seen[agent_id] = number
+        valid.append((number, agent))
+    return valid, failed
+
+async def import_agents(
+    mindsdb_service: AsyncMindsDBService,
+    body: bytes,
+    format: str,
+    concurrency: int = AGENT_IMPORT_CONCURRENCY,
+    insert_batch: int = AGENT_IMPORT_INSERT_BATCH,
+) -> AgentImportResult:
+    """
+    Validate an uploaded CSV/JSONL audience and create its agents concurrently.
+    Raises ValueError for an upload that can't be read or is too large.
+    """
+    rows = parse_rows(body, format)
+    if len(rows) > AGENT_IMPORT_MAX_ROWS:
+        raise ValueError(f"Upload has {len(rows)} rows, the limit is {AGENT_IMPORT_MAX_ROWS}")
+    valid, failed = validate_rows(rows)
+    logger.info(f"Importing {len(valid)} agents ({len(failed)} of {len(rows)} rows failed validation)")
+
+    return await create_validated(mindsdb_service, valid, failed, len(rows), concurrency, insert_batch)
+
+async def create_validated(
+    mindsdb_service: AsyncMindsDBService,
+    valid: List[Tuple[int, AgentCreate]],
+    failed: List[AgentImportRow],
+    total: int,
+    concurrency: int = AGENT_IMPORT_CONCURRENCY,
+    insert_batch: int = AGENT_IMPORT_INSERT_BATCH,
+) -> AgentImportResult:
+    """Create already-validated agents and merge the outcomes with earlier failures, by row"""
+    outcomes = await mindsdb_service.create_agents(
+        [agent for _, agent in valid], concurrency=concurrency, insert_batch=insert_batch
+    )
+    results = list(failed)
+    for (number, agent), outcome in zip(valid, outcomes):
+        if isinstance(outcome, Exception):
+            results.append(AgentImportRow(row=number, name=agent.name, error=_error_message(outcome)))
+        else:
+            results.append(AgentImportRow(row=number, id=outcome.id, name=outcome.name))
+    results.sort(key=lambda result: result.row)
+
+    created = sum(result.error is None for result in results)
+    return AgentImportResult(total=total, created=created, failed=total - created, results=results)
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+from app.models.ml_engine import MLEngineCreate, MLEngine
+from app.models.agent import AgentCreate, Agent
+from app.models.campaign import CampaignCreate, Campaign
+from app.models.listing import ListQuery
+from app.services import mindsdb_queries as queries
+from app.services.engine_catalog import EngineCatalog
+from app.services.metadata_cache import CachedListing, MetadataCache
+from app.utils.mindsdb_http import AsyncMindsDBClient
+
+logger = logging.getLogger(__name__)
+
+class AsyncMindsDBService:
+    """MindsDB service for async endpoints, backed by the shared AsyncMindsDBClient"""
+
+    def __init__(self, client: AsyncMindsDBClient, metadata_cache: MetadataCache = None, engine_catalog: EngineCatalog = None):
+        self.client = client
+        # Without a shared cache every listing goes to MindsDB
+        self.metadata_cache = metadata_cache or MetadataCache(ttl=0)
+        # Without a catalog engines are listed from MindsDB and not checked up front
+        self.engine_catalog = engine_catalog
+
+    async def ensure_schema(self):
+        """Create the project database and the tables the service relies on"""
+        await self.client.ensure_database()
+        await self.client.query(queries.create_agents_table_query())
+        await self.client.query(queries.create_campaigns_table_query())
+
+    async def create_ml_engine(self, engine: MLEngineCreate) -> MLEngine:
+        """Create a new ML engine in MindsDB"""
+        logger.info(f"Creating ML engine: {engine.name} with provider {engine.provider}")
+
+        # Set up engine parameters according to provider
+        handler, params = queries.engine_handler_params(engine)
+
+        try:
+            engine_name = queries.format_name(engine.name)
+            await self.client.query(queries.create_engine_query(engine_name, handler, params))
+
+            created = MLEngine(
+                id=engine_name,
+                name=engine.name,
+                provider=engine.provider,
+                api_key="*****",  # Hide API key for security
+                model_version=engine.model_version,
+                description=engine.description,
+                max_concurrency=engine.max_concurrency,
+                requests_per_minute=engine.requests_per_minute,
+                created_at=datetime.now()
+            )
+            if self.engine_catalog is not None:
+                await asyncio.to_thread(self.engine_catalog.put, created)
+            self.metadata_cache.invalidate("ml_engines")
+            return created
+        except Exception as e:
+            logger.error(f"Error creating ML engine: {str(e)}")
+            raise
+
+    async def list_ml_engines(self) -> CachedListing:
+        """ML engines through the read-through metadata cache"""
+        return await self.metadata_cache.get_or_load("ml_engines", self.get_ml_engines)
+
+    async def get_ml_engines(self) -> List[MLEngine]:
+        """List the ML engines from the catalog, or from MindsDB without one"""
+        if self.engine_catalog is not None:
+            return self.engine_catalog.list()
+
+        rows = []
+        for query in ("SHOW ML_ENGINES;", "SHOW ENGINES;"):
+            try:
+                rows = await self.client.query(query)
+                if rows:
+                    break
+            except Exception as e:
+                logger.warning(f"Error listing engines with {query}: {str(e)}")
+
+        engines = []
+        for row in rows:
+            if 'name' in row and 'handler' in row:
+                engines.append(
+                    MLEngine(
+                        id=row['name'],
+                        name=row['name'],
+                        provider=row['handler'],
+                        api_key="*****",  # Hide API key
+                        created_at=datetime.now()  # MindsDB might not provide creation time
+                    )
+                )
+        return engines
+
+    async def sync_ml_engines(self) -> bool:
+        """Reconcile the engine catalog with MindsDB. Returns True if it changed."""
+        rows = await self.client.query("SHOW ML_ENGINES;")
+        changed = await asyncio.to_thread(self.engine_catalog.merge, rows)
+        if changed:
+            self.metadata_cache.invalidate("ml_engines")
+        return changed
+
+    def check_ml_engine(self, ml_engine_id: str):
+        """Raise ValueError if the catalog knows the engine doesn't exist"""
+        catalog = self.engine_catalog
+        # Before the first sync an engine missing locally may still exist in MindsDB
+        if catalog is not None and catalog.synced and ml_engine_id not in catalog:
+            raise ValueError(f"ML engine not found: {ml_engine_id}")
+
+    async def create_agent(self, agent: AgentCreate) -> Agent:
+        """Create a new agent in MindsDB using the specified ML engine"""
+        logger.info(f"Creating agent: {agent.name} with ML engine: {agent.ml_engine_id}")
+        self.check_ml_engine(agent.ml_engine_id)
+
+        try:
+            agent_name = queries.format_name(agent.name)
+            prompt_template = queries.generate_agent_prompt(agent)
+            await self.client.query(queries.create_agent_query(agent_name, agent, prompt_template))
+
+            # Store the profile so listing doesn't need to describe every model
+            created = Agent(**agent.dict(), id=agent_name, created_at=datetime.now())
+            await self.client.query(queries.insert_agent_query(created))
+            self.metadata_cache.invalidate("agents")
+
+            logger.info(f"Agent created successfully: {agent_name}")
+            return created
+        except Exception as e:
+            logger.error(f"Error creating agent: {str(e)}")
+            raise
+
+    async def create_agents(
+        self, agents: List[AgentCreate], concurrency: int = 8, insert_batch: int = 500
+    ) -> List[Union[Agent, Exception]]:
+        """
+        Create many agents: CREATE MODEL statements run with bounded concurrency,
+        then the profiles are stored with multi-row INSERTs. Returns, in input
+        order, the created agent or the error for each one.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_model(agent: AgentCreate) -> Agent:
+            agent_name = queries.format_name(agent.name)
+            # Build the profile first so nothing is left half-created if it doesn't validate
+            created = Agent(**agent.dict(exclude_none=True), id=agent_name, created_at=datetime.now())
+            self.check_ml_engine(agent.ml_engine_id)
+            async with semaphore:
+                await self.client.query(
+                    queries.create_agent_query(agent_name, agent, queries.generate_agent_prompt(agent))
+                )
+            return created
+
+        results = list(await asyncio.gather(*(create_model(agent) for agent in agents), return_exceptions=True))
+
+        created = [index for index, result in enumerate(results) if isinstance(result, Agent)]
+        for start in range(0, len(created), insert_batch):
+            chunk = created[start:start + insert_batch]
+            try:
+                await self.client.query(queries.insert_agents_query([results[index] for index in chunk]))
+            except Exception as e:
+                logger.error(f"Error storing {len(chunk)} agent profiles: {str(e)}")
+                for index in chunk:
+                    results[index] = RuntimeError(f"Model created but profile not stored: {str(e)}")
+
+        if created:
+            self.metadata_cache.invalidate("agents")
+        logger.info(f"Created {sum(isinstance(result, Agent) for result in results)} of {len(agents)} agents")
+        return results
+
+    async def list_agents(self) -> CachedListing:
+        """Agents through the read-through metadata cache"""
+        return await self.metadata_cache.get_or_load("agents", self.get_agents)
+
+    async def get_agents(self) -> List[Agent]:
+        """
+        List agents with a fixed number of queries: the agents table written at
+        create time, plus the project's models for agents created before it existed.
+        """
+        profile_rows, model_rows = await asyncio.gather(
+            self.client.query(f"SELECT * FROM {queries.AGENTS_TABLE};"),
+            self.client.query(queries.list_legacy_agent_models_query()),
+            return_exceptions=True,
+        )
+        if isinstance(profile_rows, Exception):
+            logger.warning(f"Error reading agents table: {str(profile_rows)}")
+            profile_rows = []
+        if isinstance(model_rows, Exception):
+            logger.warning(f"Error reading agent models: {str(model_rows)}")
+            model_rows = []
+
+        # Agents created before the agents table only have their model attributes
+        rows = list(profile_rows)
+        known = {row.get('id') for row in rows}
+        for row in model_rows:
+            name = row.get('name')
+            if not name or name in known:
+                continue
+            attributes = queries.agent_attributes_from_training_options(row.get('training_options'))
+            if attributes is None:
+                continue
+            rows.append({"name": name.replace('_', ' ').title(), **attributes, "id": name})
+
+        agents, invalid = queries.agents_from_rows(rows)
+        for agent_id, error in invalid:
+            logger.warning(f"Skipping agent {agent_id}: {error}")
+        return agents
+
+    async def get_agent(self, agent_id: str) -> Optional[Agent]:
+        """Fetch a single agent by id from the agents table"""
+        rows = await self.client.query(queries.select_agent_query(agent_id))
+        return queries.agent_from_row(rows[0]) if rows else None
+
+    async def get_agent_prompts(self) -> Dict[str, str]:
+        """Agent id -> the prompt template its model was actually created with"""
+        rows = await self.client.query(queries.list_legacy_agent_models_query())
+        prompts = {}
+        for row in rows:
+            template = queries.prompt_template_from_training_options(row.get('training_options'))
+            if row.get('name') and template is not None:
+                prompts[row['name']] = template
+        return prompts
+
+    async def query_agents(self, list_query: ListQuery) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of agents from the agents table, filtered and projected in SQL.
+        Returns the rows and the cursor for the next page, if any.
+        """
+        rows = await self.client.query(queries.list_query(queries.AGENTS_TABLE, queries.AGENT_COLUMNS, list_query))
+        rows, next_cursor = queries.page(rows, list_query)
+        return [queries.project(row, list_query) for row in rows], next_cursor
+
+    async def create_campaign(self, campaign: CampaignCreate) -> Campaign:
+        """Create a new marketing campaign in the campaigns table"""
+        logger.info(f"Creating campaign: {campaign.name}")
+
+        try:
+            campaign_name = queries.format_name(campaign.name)
+            created = Campaign(**campaign.dict(), id=queries.campaign_id(campaign_name), created_at=datetime.now())
+            await self.client.query(queries.insert_campaign_query(created))
+            self.metadata_cache.invalidate("campaigns")
+
+            logger.info(f"Campaign created successfully: {created.id}")
+            return created
+        except Exception as e:
+            logger.error(f"Error creating campaign: {str(e)}")
+            raise
+
+    async def list_campaigns(self) -> CachedListing:
+        """Campaigns through the read-through metadata cache"""
+        return await self.metadata_cache.get_or_load("campaigns", self.get_campaigns)
+
+    async def get_campaigns(self) -> List[Campaign]:
+        """List all campaigns with a single query"""
+        rows = await self.client.query(f"SELECT * FROM {queries.CAMPAIGNS_TABLE} ORDER BY created_at;")
+
+        campaigns = []
+        for row in rows:
+            try:
+                campaigns.append(queries.campaign_from_row(row))
+            except ValueError as e:
+                logger.warning(f"Skipping campaign {row.get('id')}: {str(e)}")
+        return campaigns
+
+    async def query_campaigns(self, list_query: ListQuery) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of campaigns, filtered and projected in SQL"""
+        rows = await self.client.query(queries.list_query(queries.CAMPAIGNS_TABLE, queries.CAMPAIGN_COLUMNS, list_query))
+        rows, next_cursor = queries.page(rows, list_query)
+        return [queries.project(row, list_query) for row in rows], next_cursor
+
+    async def get_campaign(self, campaign_id: str) -> Optional[Campaign]:
+        """Fetch a single campaign by id"""
+        rows = await self.client.query(queries.select_campaign_query(campaign_id))
+        return queries.campaign_from_row(rows[0]) if rows else None
@@ -0,0 +1,227 @@
+import os
+import json
+import asyncio
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from app.config import ENGINES_DIR, ENGINE_CATALOG_SYNC_INTERVAL
+from app.models.ml_engine import MLEngine
+
+logger = logging.getLogger(__name__)
+
+# MindsDB handler for each provider; engines on other handlers aren't ours
+PROVIDER_HANDLERS = {"openai": "openai", "anthropic": "anthropic", "llama": "llama", "gemini": "google"}
+HANDLER_PROVIDERS = {handler: provider for provider, handler in PROVIDER_HANDLERS.items()}
+
+# Descriptor "source" of engines the catalog added from a MindsDB sync
+SYNCED_SOURCE = "mindsdb"
+
+class EngineCatalog:
+    """
+    ML engine descriptors, one JSON file per engine under ENGINES_DIR.
+
+    All descriptors are held in memory, indexed by id and by provider, so
+    listing engines and checking an agent's ml_engine_id don't touch MindsDB.
+    Files are replaced atomically; API keys are never stored. A background
+    task reconciles the catalog with MindsDB's SHOW ML_ENGINES; only
+    descriptors that task added are ever pruned.
+    """
+
+    def __init__(self, path: str = ENGINES_DIR):
+        self.path = path
+        self.synced = False  # True once the catalog has been reconciled with MindsDB
+        self._engines: Dict[str, MLEngine] = {}
+        self._by_provider: Dict[str, Dict[str, MLEngine]] = {}
+        self._synced_ids: Set[str] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.load()
+
+    def load(self):
+        """Read every descriptor file, skipping ones that can't be parsed"""
+        engines, synced_ids = {}, set()
+        if os.path.isdir(self.path):
+            for filename in sorted(os.listdir(self.path)):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.path, filename), encoding="utf-8") as f:
+                        descriptor = json.load(f)
+                    engine = _from_descriptor(descriptor)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping engine descriptor {filename}: {str(e)}")
+                    continue
+                if engine is None:
+                    logger.warning(f"Skipping engine descriptor {filename}: missing name or unsupported handler")
+                    continue
+                engines[engine.id] = engine
+                if descriptor.get("source") == SYNCED_SOURCE:
+                    synced_ids.add(engine.id)
+        with self._lock:
+            self._engines = {}
+            self._by_provider = {}
+            self._synced_ids = synced_ids
+            for engine in engines.values():
+                self._index(engine)
+        logger.info(f"Loaded {len(engines)} ML engine descriptors from {self.path}")
+
+    def _index(self, engine: MLEngine):
+        previous = self._engines.get(engine.id)
+        if previous is not None:
+            self._by_provider.get(previous.provider, {}).pop(engine.id, None)
+        self._engines[engine.id] = engine
+        self._by_provider.setdefault(engine.provider, {})[engine.id] = engine
+
+    def get(self, engine_id: str) -> Optional[MLEngine]:
+        return self._engines.get(engine_id)
+
+    def __contains__(self, engine_id: str) -> bool:
+        return engine_id in self._engines
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def list(self) -> List[MLEngine]:
+        with self._lock:
+            return sorted(self._engines.values(), key=lambda engine: engine.id)
+
+    def by_provider(self, provider: str) -> List[MLEngine]:
+        with self._lock:
+            return sorted(self._by_provider.get(provider, {}).values(), key=lambda engine: engine.id)
+
+    def put(self, engine: MLEngine, source: Optional[str] = None):
+        """Add or replace an engine and write its descriptor"""
+        engine = engine.copy(update={"api_key": "*****"})
+        with self._lock:
+            self._write(engine, source)
+            self._index(engine)
+            if source == SYNCED_SOURCE:
+                self._synced_ids.add(engine.id)
+            else:
+                self._synced_ids.discard(engine.id)
+
+    def remove(self, engine_id: str) -> bool:
+        with self._lock:
+            engine = self._engines.pop(engine_id, None)
+            if engine is None:
+                return False
+            self._by_provider.get(engine.provider, {}).pop(engine_id, None)
+            self._synced_ids.discard(engine_id)
+            try:
+                os.remove(self._file(engine_id))
+            except FileNotFoundError:
+                pass
+            return True
+
+    def _file(self, engine_id: str) -> str:
+        return os.path.join(self.path, f"{engine_id}.json")
+
+    def _write(self, engine: MLEngine, source: Optional[str] = None):
+        # Write a temp file in the same directory and rename it over the old
+        # descriptor, so readers never see a half-written file
+        os.makedirs(self.path, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path, prefix=f".{engine.id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(_to_descriptor(engine, source), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._file(engine.id))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def merge(self, rows: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Reconcile with MindsDB's engine list: add engines created elsewhere and
+        drop ones an earlier sync added that MindsDB no longer has. Descriptors
+        written locally are never removed, and descriptors of engines MindsDB
+        still has keep their local details. Returns True if anything changed.
+        """
+        remote = {}
+        for row in rows:
+            provider = HANDLER_PROVIDERS.get(row.get("handler"))
+            if row.get("name") and provider is not None:
+                remote[row["name"]] = provider
+
+        changed = False
+        for engine_id, provider in remote.items():
+            previous = self.get(engine_id)
+            if previous is None or previous.provider != provider:
+                try:
+                    engine = MLEngine(id=engine_id, name=engine_id, provider=provider, api_key="*****", created_at=datetime.now())
+                except ValueError as e:
+                    logger.warning(f"Skipping ML engine {engine_id} found in MindsDB: {str(e)}")
+                    continue
+                logger.info(f"Adding ML engine {engine_id} found in MindsDB to the catalog")
+                # A local descriptor stays local when MindsDB reports another provider for it
+                self.put(engine, source=SYNCED_SOURCE if previous is None or engine_id in self._synced_ids else None)
+                changed = True
+        for engine in self.list():
+            if engine.id not in remote and engine.id in self._synced_ids:
+                logger.info(f"Removing ML engine {engine.id} that MindsDB no longer has from the catalog")
+                self.remove(engine.id)
+                changed = True
+        self.synced = True
+        return changed
+
+    def start_sync(self, sync: Callable[[], Awaitable[Any]], interval: float = ENGINE_CATALOG_SYNC_INTERVAL):
+        """Run `sync` now and then every `interval` seconds in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sync_loop(sync, interval))
+
+    async def _sync_loop(self, sync: Callable[[], Awaitable[Any]], interval: float):
+        while True:
+            try:
+                await sync()
+            except Exception as e:
+                # MindsDB may be down; the catalog keeps serving what it has
+                logger.warning(f"ML engine catalog sync failed: {str(e)}")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+def _to_descriptor(engine: MLEngine, source: Optional[str] = None) -> Dict[str, Any]:
+    descriptor = {
+        "name": engine.id,
+        "handler": PROVIDER_HANDLERS[engine.provider],
+        "model_version": engine.model_version,
+        "description": engine.description,
+        "max_concurrency": engine.max_concurrency,
+        "requests_per_minute": engine.requests_per_minute,
+        "created_at": engine.created_at.isoformat(),
+        "updated_at": engine.updated_at.isoformat() if engine.updated_at else None,
+    }
+    if source is not None:
+        descriptor["source"] = source
+    return descriptor
+
+def _from_descriptor(descriptor: Any) -> Optional[MLEngine]:
+    if not isinstance(descriptor, dict) or not descriptor.get("name"):
+        return None
+    provider = HANDLER_PROVIDERS.get(descriptor.get("handler"))
+    if provider is None:
+        return None
+    return MLEngine(
+        id=descriptor["name"],
+        name=descriptor["name"],
+        provider=provider,
+        api_key="*****",
+        model_version=descriptor.get("model_version"),
+        description=descriptor.get("description"),
+        max_concurrency=descriptor.get("max_concurrency"),
+        requests_per_minute=descriptor.get("requests_per_minute"),
+        created_at=descriptor.get("created_at") or datetime.now(),
+        updated_at=descriptor.get("updated_at"),
+    )
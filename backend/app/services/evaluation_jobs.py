@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import DATA_DIR, EVALUATION_JOB_WORKERS
+from app.models.evaluation import AgentEvaluation, EvaluationJob, EvaluationRequest
+from app.services.evaluation_service import EvaluationService
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states are picked up again after a restart
+UNFINISHED = ("queued", "running")
+
+class JobStore:
+    """
+    Evaluation jobs and their per-agent results in SQLite. Results are the
+    checkpoint: a resumed job skips every agent that already has a successful one.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(DATA_DIR, "evaluation_jobs.sqlite3")
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                campaign_id TEXT NOT NULL,
+                request TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                agent_id TEXT NOT NULL,
+                score INTEGER,
+                failed INTEGER NOT NULL,
+                evaluation TEXT NOT NULL,
+                PRIMARY KEY (job_id, agent_id)
+            )
+            """
+        )
+        self._db.commit()
+
+    def create(self, job_id: str, request: EvaluationRequest):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, campaign_id, request, status, total, created_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, request.campaign_id, request.json(), len(set(request.agent_ids or ())), datetime.now().isoformat()),
+            )
+            self._db.commit()
+
+    def update(self, job_id: str, **fields: Any):
+        with self._lock:
+            self._db.execute(
+                f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._with_counts(row) if row is not None else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM jobs ORDER BY created_at DESC").fetchall()
+            return [self._with_counts(row) for row in rows]
+
+    def _with_counts(self, row: sqlite3.Row) -> Dict[str, Any]:
+        completed, failed, average_score = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(failed), 0), AVG(score) FROM job_results WHERE job_id = ?",
+            (row["id"],),
+        ).fetchone()
+        return {**dict(row), "completed": completed, "failed": failed, "average_score": average_score}
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id FROM jobs WHERE status IN ({', '.join('?' * len(UNFINISHED))}) ORDER BY created_at",
+                UNFINISHED,
+            ).fetchall()
+            return [row["id"] for row in rows]
+
+    def checkpoint(self, job_id: str, evaluations: Iterable[AgentEvaluation]):
+        """Store results; a retried agent replaces its earlier failure"""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO job_results (job_id, agent_id, score, failed, evaluation) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (job_id, evaluation.agent_id, evaluation.score, evaluation.error is not None, evaluation.json())
+                    for evaluation in evaluations
+                ],
+            )
+            self._db.commit()
+
+    def succeeded_agent_ids(self, job_id: str) -> Set[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT agent_id FROM job_results WHERE job_id = ? AND NOT failed", (job_id,)
+            ).fetchall()
+            return {row["agent_id"] for row in rows}
+
+    def results(self, job_id: str) -> List[AgentEvaluation]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT evaluation FROM job_results WHERE job_id = ? ORDER BY rowid", (job_id,)
+            ).fetchall()
+            return [AgentEvaluation(**json.loads(row["evaluation"])) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+class EvaluationJobManager:
+    """
+    Runs evaluations in the background on a small pool of workers. Each job
+    goes through the evaluation service (and so the scheduler's per-engine
+    limits) and checkpoints results as they arrive; jobs interrupted by a
+    restart are resumed on startup.
+    """
+
+    def __init__(self, service: EvaluationService, store: Optional[JobStore] = None, workers: int = EVALUATION_JOB_WORKERS):
+        self.service = service
+        self.store = store or JobStore()
+        self.worker_count = workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        # job id -> (monotonic start, agents processed since then)
+        self._progress: Dict[str, Tuple[float, int]] = {}
+
+    def start(self):
+        """Start the workers and queue jobs a previous process didn't finish"""
+        if self._workers:
+            return
+        for job_id in self.store.unfinished():
+            logger.info(f"Resuming evaluation job {job_id}")
+            self.store.update(job_id, status="queued")
+            self._queue.put_nowait(job_id)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def submit(self, request: EvaluationRequest) -> EvaluationJob:
+        """Queue an evaluation. Raises LookupError for an unknown campaign."""
+        if await self.service.mindsdb.get_campaign(request.campaign_id) is None:
+            raise LookupError(f"Campaign not found: {request.campaign_id}")
+        update = {}
+        if request.agent_ids is None:
+            # Fix the audience now so a resumed job evaluates the same agents
+            update["agent_ids"] = [agent.id for agent in (await self.service.mindsdb.list_agents()).items]
+        if "priority" not in request.model_fields_set:
+            # Background jobs shouldn't hold up interactive evaluations
+            update["priority"] = "bulk"
+        request = request.copy(update=update)
+
+        self.start()
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        await asyncio.to_thread(self.store.create, job_id, request)
+        await self._queue.put(job_id)
+        logger.info(f"Queued evaluation job {job_id} for campaign {request.campaign_id}")
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[EvaluationJob]:
+        row = await asyncio.to_thread(self.store.get, job_id)
+        return self._job(row) if row is not None else None
+
+    async def list(self) -> List[EvaluationJob]:
+        return [self._job(row) for row in await asyncio.to_thread(self.store.list)]
+
+    async def results(self, job_id: str) -> List[AgentEvaluation]:
+        return await asyncio.to_thread(self.store.results, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[EvaluationJob]:
+        """Stop a job, keeping the results it has so far"""
+        job = await self.get(job_id)
+        if job is None or job.status not in UNFINISHED:
+            return job
+        await asyncio.to_thread(self.store.update, job_id, status="cancelled", finished_at=datetime.now().isoformat())
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return await self.get(job_id)
+
+    def _job(self, row: Dict[str, Any]) -> EvaluationJob:
+        job = EvaluationJob(**{key: value for key, value in row.items() if key != "request"})
+        progress = self._progress.get(job.id)
+        if job.status == "running" and progress is not None:
+            started, processed = progress
+            elapsed = time.monotonic() - started
+            if processed and elapsed > 0:
+                job.throughput = processed / elapsed
+                job.eta_seconds = max(job.total - job.completed, 0) / job.throughput
+        return job
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            task = asyncio.create_task(self._run(job_id))
+            self._running[job_id] = task
+            try:
+                # wait() rather than await so a cancelled job doesn't stop the worker
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                await asyncio.wait({task})
+                raise
+            finally:
+                self._running.pop(job_id, None)
+                self._progress.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        row = await asyncio.to_thread(self.store.get, job_id)
+        if row is None or row["status"] not in UNFINISHED:
+            return
+        request = EvaluationRequest(**json.loads(row["request"]))
+        await asyncio.to_thread(self.store.update, job_id, status="running", started_at=datetime.now().isoformat())
+
+        pending: List[AgentEvaluation] = []
+        try:
+            agent_ids = list(dict.fromkeys(request.agent_ids))
+            succeeded = await asyncio.to_thread(self.store.succeeded_agent_ids, job_id)
+            remaining = [agent_id for agent_id in agent_ids if agent_id not in succeeded]
+            logger.info(f"Evaluation job {job_id}: {len(remaining)} of {len(agent_ids)} agents left")
+
+            self._progress[job_id] = (time.monotonic(), 0)
+            if remaining:
+                run = await self.service.prepare(request.copy(update={"agent_ids": remaining}))
+                async for evaluation in self.service.run(run):
+                    pending.append(evaluation)
+                    started, processed = self._progress[job_id]
+                    self._progress[job_id] = (started, processed + 1)
+                    if len(pending) >= request.batch_size:
+                        await asyncio.to_thread(self.store.checkpoint, job_id, pending)
+                        pending = []
+                await asyncio.to_thread(self.store.checkpoint, job_id, pending)
+                pending = []
+
+            await asyncio.to_thread(self.store.update, job_id, status="completed", finished_at=datetime.now().isoformat())
+            logger.info(f"Evaluation job {job_id} completed")
+        except asyncio.CancelledError:
+            # Cancelled by the user, or the app is shutting down and the job
+            # stays "running" to be resumed on the next start
+            raise
+        except Exception as e:
+            logger.error(f"Evaluation job {job_id} failed: {str(e)}")
+            await asyncio.to_thread(
+                self.store.update, job_id, status="failed", error=str(e), finished_at=datetime.now().isoformat()
+            )
+        finally:
+            # Synchronous so it also runs when the job is cancelled
+            if pending:
+                self.store.checkpoint(job_id, pending)
+
+    async def close(self):
+        """Stop the workers; interrupted jobs resume on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.store.close()
@@ -0,0 +1,198 @@
+import time
+import random
+import asyncio
+import logging
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config import (
+    EVALUATION_DEFAULT_CONCURRENCY,
+    EVALUATION_DEFAULT_REQUESTS_PER_MINUTE,
+    EVALUATION_MAX_RETRIES,
+    EVALUATION_RETRY_BASE_DELAY,
+    EVALUATION_RETRY_MAX_DELAY,
+)
+from app.models.ml_engine import MLEngine
+from app.utils import tracing
+from app.utils.mindsdb_http import MindsDBConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Queue priorities - lower runs first
+PRIORITIES = {"interactive": 0, "bulk": 10}
+
+# Error messages that indicate a call is worth retrying
+RETRYABLE_MARKERS = ("429", "rate limit", "too many requests", "timeout", "timed out", "overloaded", "503")
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (MindsDBConnectionError, asyncio.TimeoutError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a fixed rate"""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1):
+        """
+        Wait until the tokens are available and take them. Requests larger than
+        the bucket wait for a full bucket and leave it in debt.
+        """
+        async with self._lock:
+            needed = min(tokens, self.capacity)
+            self._refill()
+            while self.tokens < needed:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+class _EngineQueue:
+    """Priority queue and worker pool for a single engine"""
+
+    def __init__(self, engine_id: str, concurrency: int, requests_per_minute: int):
+        self.engine_id = engine_id
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.configure(concurrency, requests_per_minute)
+
+    def configure(self, concurrency: int, requests_per_minute: int):
+        # Allow short bursts of up to ten seconds' worth of requests
+        rate = requests_per_minute / 60
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, max(1, rate * 10))
+
+    def start(self, run: Callable):
+        for index in range(self.concurrency):
+            worker = self.workers.get(index)
+            if worker is None or worker.done():
+                self.workers[index] = asyncio.create_task(run(self, index))
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.cancel()
+        self.workers = {}
+
+class EvaluationScheduler:
+    """
+    Fans evaluation calls out per engine with bounded concurrency, a token
+    bucket rate limit, jittered exponential backoff retries and priorities.
+    """
+
+    def __init__(
+        self,
+        default_concurrency: int = EVALUATION_DEFAULT_CONCURRENCY,
+        default_requests_per_minute: int = EVALUATION_DEFAULT_REQUESTS_PER_MINUTE,
+        max_retries: int = EVALUATION_MAX_RETRIES,
+        retry_base_delay: float = EVALUATION_RETRY_BASE_DELAY,
+        retry_max_delay: float = EVALUATION_RETRY_MAX_DELAY,
+    ):
+        self.default_concurrency = default_concurrency
+        self.default_requests_per_minute = default_requests_per_minute
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._limits: Dict[str, tuple] = {}
+        self._engines: Dict[str, _EngineQueue] = {}
+        self._sequence = itertools.count()
+
+    def configure_engine(self, engine_id: str, max_concurrency: Optional[int] = None, requests_per_minute: Optional[int] = None):
+        """Set an engine's concurrency and rate limit"""
+        limits = (
+            max_concurrency or self.default_concurrency,
+            requests_per_minute or self.default_requests_per_minute,
+        )
+        self._limits[engine_id] = limits
+        engine_queue = self._engines.get(engine_id)
+        if engine_queue is not None:
+            # Surplus workers exit after their current call
+            engine_queue.configure(*limits)
+
+    def configure_from_engine(self, engine: MLEngine):
+        self.configure_engine(engine.id, engine.max_concurrency, engine.requests_per_minute)
+
+    def _engine_queue(self, engine_id: str) -> _EngineQueue:
+        engine_queue = self._engines.get(engine_id)
+        if engine_queue is None:
+            concurrency, requests_per_minute = self._limits.get(
+                engine_id, (self.default_concurrency, self.default_requests_per_minute)
+            )
+            engine_queue = _EngineQueue(engine_id, concurrency, requests_per_minute)
+            self._engines[engine_id] = engine_queue
+        engine_queue.start(self._worker)
+        return engine_queue
+
+    async def submit(
+        self,
+        engine_id: str,
+        call: Callable[[], Awaitable[Any]],
+        priority: str = "interactive",
+        cost: int = 1,
+    ) -> Any:
+        """
+        Queue a call against an engine and wait for its result.
+        `cost` is the number of provider requests the call makes (e.g. batch size).
+        """
+        future = asyncio.get_running_loop().create_future()
+        engine_queue = self._engine_queue(engine_id)
+        # Workers outlive requests, so carry the caller's query trace with the call
+        call = tracing.bind(call)
+        await engine_queue.queue.put((PRIORITIES[priority], next(self._sequence), call, cost, future))
+        return await future
+
+    async def _worker(self, engine_queue: _EngineQueue, index: int):
+        while index < engine_queue.concurrency:
+            job = await engine_queue.queue.get()
+            if index >= engine_queue.concurrency:
+                # Concurrency was lowered while waiting - hand the job back
+                engine_queue.queue.task_done()
+                await engine_queue.queue.put(job)
+                break
+
+            _, _, call, cost, future = job
+            try:
+                if future.cancelled():
+                    continue
+                result = await self._run_with_retries(engine_queue, call, cost)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                engine_queue.queue.task_done()
+
+    async def _run_with_retries(self, engine_queue: _EngineQueue, call: Callable, cost: int):
+        for attempt in range(self.max_retries + 1):
+            await engine_queue.bucket.acquire(cost)
+            try:
+                return await call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                # Full jitter keeps retries from many workers from lining up
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+                logger.warning(
+                    f"Call on engine {engine_queue.engine_id} failed (attempt {attempt+1}), retrying in {delay:.1f}s: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    def close(self):
+        """Cancel all workers"""
+        for engine_queue in self._engines.values():
+            engine_queue.stop()
+        self._engines = {}
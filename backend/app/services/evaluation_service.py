@@ -0,0 +1,252 @@
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.config import PROMPT_LAYOUT, AGENT_RESPONSE_FORMAT
+from app.models.agent import Agent
+from app.models.campaign import Campaign
+from app.models.evaluation import AgentEvaluation, EvaluationRequest, EvaluationResult
+from app.services import mindsdb_queries as queries
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.services.evaluation_scheduler import EvaluationScheduler
+from app.services.prompts import estimate_tokens
+from app.services.response_cache import ResponseCache
+from app.services.response_parsing import parse_response, parse_score  # parse_score re-exported for existing callers
+from app.services.results_store import AGENT_ATTRIBUTE_COLUMNS, ResultsStore
+
+logger = logging.getLogger(__name__)
+
+def average_score(evaluations: List[AgentEvaluation]) -> Optional[float]:
+    scores = [evaluation.score for evaluation in evaluations if evaluation.score is not None]
+    return sum(scores) / len(scores) if scores else None
+
+class EvaluationRun:
+    """A prepared evaluation: cache hits ready to return and batches still to run"""
+
+    def __init__(self, campaign: Campaign, priority: str, agents: Dict[str, Agent], prompts: Dict[str, str],
+                 keys: Dict[str, str], ready: List[AgentEvaluation], batches: List[List[Agent]]):
+        self.campaign = campaign
+        self.priority = priority
+        self.agents = agents
+        self.prompts = prompts
+        self.keys = keys
+        self.ready = ready
+        self.batches = batches
+
+    @property
+    def total(self) -> int:
+        return len(self.ready) + sum(len(batch) for batch in self.batches)
+
+class EvaluationService:
+    """Evaluates a campaign against agent models using batched, scheduled MindsDB predictions"""
+
+    def __init__(self, mindsdb_service: AsyncMindsDBService, scheduler: EvaluationScheduler, cache: ResponseCache,
+                 results_store: Optional[ResultsStore] = None):
+        self.mindsdb = mindsdb_service
+        self.scheduler = scheduler
+        self.cache = cache
+        self.results_store = results_store
+
+    async def evaluate_campaign(self, request: EvaluationRequest) -> EvaluationResult:
+        """Evaluate a campaign against the requested agents (or all of them)"""
+        run = await self.prepare(request)
+        evaluations = [evaluation async for evaluation in self.run(run)]
+
+        return EvaluationResult(
+            campaign_id=run.campaign.id,
+            evaluations=evaluations,
+            average_score=average_score(evaluations),
+            created_at=datetime.now()
+        )
+
+    async def prepare(self, request: EvaluationRequest, batch_size: int = None) -> "EvaluationRun":
+        """
+        Resolve the campaign and agents, serve what the response cache can and
+        split the rest into per-engine batches. Raises LookupError for an unknown campaign.
+        """
+        campaign = await self.mindsdb.get_campaign(request.campaign_id)
+        if campaign is None:
+            raise LookupError(f"Campaign not found: {request.campaign_id}")
+
+        agents, ready = await self._resolve_agents(request.agent_ids)
+
+        # Serve repeat evaluations from the response cache
+        prompts = await self._agent_prompts(agents)
+        keys = {agent.id: self._cache_key(agent, campaign, prompts[agent.id]) for agent in agents}
+        cached = {} if request.bypass_cache else await asyncio.to_thread(self.cache.get_many, keys.values())
+        pending = []
+        for agent in agents:
+            response = cached.get(keys[agent.id])
+            if response is None:
+                pending.append(agent)
+                continue
+            ready.append(AgentEvaluation(
+                agent_id=agent.id,
+                ml_engine_id=agent.ml_engine_id,
+                response=response,
+                **parse_response(response)._asdict(),
+                cached=True
+            ))
+
+        # One batched prediction per engine and chunk
+        batches = [
+            batch
+            for engine_agents in self._group_by_engine(pending).values()
+            for batch in self._chunk(engine_agents, batch_size or request.batch_size)
+        ]
+        logger.info(
+            f"Evaluating campaign {campaign.id} against {len(agents)} agents "
+            f"({len(agents) - len(pending)} cached) in {len(batches)} batches"
+        )
+        return EvaluationRun(campaign, request.priority, {agent.id: agent for agent in agents}, prompts, keys, ready, batches)
+
+    async def run(self, run: "EvaluationRun") -> AsyncIterator[AgentEvaluation]:
+        """Yield evaluations as they complete, with every batch in flight at once"""
+        await self._record(run, run.ready)
+        for evaluation in run.ready:
+            yield evaluation
+
+        tasks = [
+            asyncio.create_task(self._evaluate_batch(run.campaign, batch, run.priority))
+            for batch in run.batches
+        ]
+        try:
+            for next_batch in asyncio.as_completed(tasks):
+                batch_evaluations = await next_batch
+                fresh = {
+                    run.keys[evaluation.agent_id]: evaluation.response
+                    for evaluation in batch_evaluations
+                    if evaluation.error is None and evaluation.response is not None
+                }
+                if fresh:
+                    await asyncio.to_thread(self.cache.set_many, fresh)
+                await self._record(run, batch_evaluations)
+                for evaluation in batch_evaluations:
+                    yield evaluation
+        finally:
+            # Stop outstanding work if the consumer goes away (e.g. a closed stream)
+            for task in tasks:
+                task.cancel()
+
+    async def _record(self, run: "EvaluationRun", evaluations: List[AgentEvaluation]):
+        """Add evaluations to the results store behind /api/analytics"""
+        if self.results_store is None or not evaluations:
+            return
+        try:
+            await asyncio.to_thread(self.results_store.add_many, self._result_records(run, evaluations))
+        except Exception as e:
+            # Analytics are best effort; never fail an evaluation over them
+            logger.warning(f"Failed to store evaluation results: {str(e)}")
+
+    @staticmethod
+    def _result_records(run: "EvaluationRun", evaluations: List[AgentEvaluation]) -> List[Dict[str, Any]]:
+        campaign_tokens = estimate_tokens(EvaluationService._campaign_text(run.campaign))
+        records = []
+        for evaluation in evaluations:
+            agent = run.agents.get(evaluation.agent_id)
+            record = {
+                "campaign_id": run.campaign.id,
+                **evaluation.dict(),
+                "prompt_tokens": None,
+                "response_tokens": estimate_tokens(evaluation.response) if evaluation.response else None,
+            }
+            if agent is not None:
+                record["prompt_tokens"] = estimate_tokens(run.prompts[agent.id]) + campaign_tokens
+                record.update({column: getattr(agent, column) for column in AGENT_ATTRIBUTE_COLUMNS})
+            records.append(record)
+        return records
+
+    async def _resolve_agents(self, agent_ids: Optional[List[str]]):
+        """Look up the requested agents, reporting unknown ids as failed evaluations"""
+        agents = (await self.mindsdb.list_agents()).items
+        if agent_ids is None:
+            return agents, []
+
+        by_id = {agent.id: agent for agent in agents}
+        found = [by_id[agent_id] for agent_id in dict.fromkeys(agent_ids) if agent_id in by_id]
+        missing = [
+            AgentEvaluation(agent_id=agent_id, error="Agent not found")
+            for agent_id in dict.fromkeys(agent_ids) if agent_id not in by_id
+        ]
+        return found, missing
+
+    async def _agent_prompts(self, agents: List[Agent]) -> Dict[str, str]:
+        """
+        Agent id -> the prompt its model was created with. Agents whose model
+        doesn't report one get the prompt the current settings would render.
+        """
+        try:
+            stored = await self.mindsdb.get_agent_prompts()
+        except Exception as e:
+            logger.warning(f"Failed to read agent prompts: {str(e)}")
+            stored = {}
+        return {
+            agent.id: stored.get(agent.id) or queries.generate_agent_prompt(agent, PROMPT_LAYOUT, AGENT_RESPONSE_FORMAT)
+            for agent in agents
+        }
+
+    def _cache_key(self, agent: Agent, campaign: Campaign, prompt: str) -> str:
+        # The engine's model version keeps answers from a replaced model from being served
+        catalog = self.mindsdb.engine_catalog
+        engine = catalog.get(agent.ml_engine_id) if catalog is not None else None
+        return ResponseCache.make_key(
+            prompt, EvaluationService._campaign_text(campaign), agent.ml_engine_id,
+            engine.model_version if engine is not None else None
+        )
+
+    @staticmethod
+    def _campaign_text(campaign: Campaign) -> str:
+        # Only the campaign fields that reach the prompt template matter
+        return "\n".join((
+            campaign.name, campaign.marketing_channel, campaign.message_type, campaign.description, campaign.content
+        ))
+
+    @staticmethod
+    def _group_by_engine(agents: List[Agent]) -> Dict[str, List[Agent]]:
+        groups: Dict[str, List[Agent]] = {}
+        for agent in agents:
+            groups.setdefault(agent.ml_engine_id, []).append(agent)
+        return groups
+
+    @staticmethod
+    def _chunk(agents: List[Agent], size: int) -> List[List[Agent]]:
+        return [agents[i:i + size] for i in range(0, len(agents), size)]
+
+    async def _evaluate_batch(self, campaign: Campaign, agents: List[Agent], priority: str) -> List[AgentEvaluation]:
+        """Run one prediction statement for a batch of agents sharing an engine"""
+        query = queries.evaluate_agents_query(campaign.id, [agent.id for agent in agents])
+        start = time.perf_counter()
+        try:
+            # Each agent in the batch is one provider call against the engine's limits
+            rows = await self.scheduler.submit(
+                agents[0].ml_engine_id,
+                lambda: self.mindsdb.client.query(query),
+                priority=priority,
+                cost=len(agents),
+            )
+        except Exception as e:
+            logger.warning(f"Batch evaluation of {len(agents)} agents failed: {str(e)}")
+            return [
+                AgentEvaluation(agent_id=agent.id, ml_engine_id=agent.ml_engine_id, error=str(e))
+                for agent in agents
+            ]
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        responses = {row.get('agent_id'): row.get('response') for row in rows}
+        evaluations = []
+        for agent in agents:
+            if agent.id not in responses:
+                evaluations.append(AgentEvaluation(
+                    agent_id=agent.id, ml_engine_id=agent.ml_engine_id, error="No response returned", latency_ms=latency_ms
+                ))
+                continue
+            response = responses[agent.id]
+            evaluations.append(AgentEvaluation(
+                agent_id=agent.id,
+                ml_engine_id=agent.ml_engine_id,
+                response=response,
+                **parse_response(response)._asdict(),
+                latency_ms=latency_ms
+            ))
+        return evaluations
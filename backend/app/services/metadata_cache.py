@@ -0,0 +1,64 @@
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, List
+from pydantic import BaseModel
+from app.config import METADATA_CACHE_TTL
+from app.utils.serialization import dump_model_list
+
+logger = logging.getLogger(__name__)
+
+class CachedListing:
+    """A listing with its serialized JSON body and ETag, computed once per load"""
+
+    def __init__(self, items: List[BaseModel]):
+        self.items = items
+        self.body = dump_model_list(items)
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.loaded_at = time.monotonic()
+
+class MetadataCache:
+    """
+    TTL read-through cache in front of the MindsDB listings.
+
+    Loads are single-flight per key, so a burst of requests after expiry
+    makes one MindsDB round trip. Writes invalidate the affected key.
+    """
+
+    def __init__(self, ttl: float = METADATA_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, CachedListing] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._generations: Dict[str, int] = {}
+
+    def _fresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+        return None
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[List[BaseModel]]]) -> CachedListing:
+        """Return the cached listing for `key`, loading it if missing or expired"""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                return entry
+
+            generation = self._generations.get(key, 0)
+            entry = CachedListing(await loader())
+
+            # Don't store a listing that a write invalidated while it loaded
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = entry
+            return entry
+
+    def invalidate(self, key: str):
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.pop(key, None)
+        logger.info(f"Invalidated cached {key} listing")
@@ -0,0 +1,404 @@
+import ast
+import json
+import base64
+from datetime import datetime
+from typing import Annotated, Any, Callable, Dict, Iterable, List, Optional, Tuple
+from pydantic import ValidationError, WrapValidator
+from app.models.ml_engine import MLEngineCreate
+from app.models.agent import AgentCreate, Agent
+from app.models.campaign import Campaign
+from app.models.listing import ListQuery
+from app.services.prompts import CAMPAIGN_PROMPT_SECTION, generate_agent_prompt  # Re-exported for existing callers
+from app.utils.serialization import gc_paused, loads, type_adapter
+
+# SQL builders shared by the sync and async MindsDB services
+
+PROJECT = "marketing_agents"
+
+# Agent profiles are written here at create time so listing is a single SELECT
+AGENTS_TABLE = f"{PROJECT}.agents"
+
+# All campaigns live in one table keyed by id
+CAMPAIGNS_TABLE = f"{PROJECT}.campaigns"
+
+# Columns that can be filtered on and projected in list endpoints
+AGENT_COLUMNS = tuple(field for field in Agent.model_fields if field != "updated_at")
+CAMPAIGN_COLUMNS = tuple(field for field in Campaign.model_fields if field != "updated_at")
+
+# Agent columns holding JSON-encoded lists/objects
+AGENT_JSON_COLUMNS = (
+    "interests",
+    "personality_traits",
+    "buying_preferences",
+    "purchase_behaviors",
+    "communication_preferences",
+    "social_media_usage",
+)
+
+def format_name(name: str) -> str:
+    """Format a name to comply with MindsDB naming requirements"""
+    return name.lower().replace(' ', '_').replace('-', '_')
+
+def quote(value: Any) -> str:
+    """Render a value as a SQL string literal"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def engine_handler_params(engine: MLEngineCreate) -> Tuple[str, Dict[str, Any]]:
+    """Map an engine definition to a MindsDB handler and its parameters"""
+    if engine.provider == "openai":
+        handler = "openai"
+        params = {
+            "openai_api_key": engine.api_key
+        }
+    elif engine.provider == "anthropic":
+        handler = "anthropic"
+        params = {
+            "anthropic_api_key": engine.api_key
+        }
+    elif engine.provider == "llama":
+        handler = "llama"
+        params = {}
+        if engine.api_key:
+            params["api_key"] = engine.api_key
+    elif engine.provider == "gemini":
+        handler = "google"
+        params = {
+            "api_key": engine.api_key
+        }
+    else:
+        raise ValueError(f"Unsupported provider: {engine.provider}")
+
+    if engine.model_version:
+        params["model_name"] = engine.model_version
+    return handler, params
+
+def create_engine_query(engine_name: str, handler: str, params: Dict[str, Any]) -> str:
+    return f"""
+            CREATE ENGINE {PROJECT}.{engine_name}
+            FROM {handler}
+            USING {json.dumps(params)};"""
+
+def agent_attributes(agent: AgentCreate) -> Dict[str, Any]:
+    """Attributes stored alongside an agent model, without None values"""
+    attributes = {
+        "age": agent.age,
+        "gender": agent.gender,
+        "occupation": agent.occupation,
+        "income_level": agent.income_level,
+        "education_level": agent.education_level,
+        "interests": agent.interests,
+        "personality_traits": agent.personality_traits,
+        "purchase_behaviors": agent.purchase_behaviors,
+        "purchase_frequency": agent.purchase_frequency,
+        "communication_preferences": agent.communication_preferences,
+        "location": agent.location,
+        "social_media_usage": agent.social_media_usage,
+        "brand_loyalty": agent.brand_loyalty,
+        "price_sensitivity": agent.price_sensitivity,
+        "tech_savviness": agent.tech_savviness
+    }
+
+    # Filter out None values to avoid MindsDB errors
+    return {k: v for k, v in attributes.items() if v is not None}
+
+def create_agent_query(agent_name: str, agent: AgentCreate, prompt_template: str) -> str:
+    attributes_json = json.dumps(agent_attributes(agent), default=str)
+    description = agent.description or ""
+    return f"""
+            CREATE MODEL {PROJECT}.{agent_name}
+            PREDICT response
+            USING
+                engine = {quote(agent.ml_engine_id)},
+                prompt_template = {quote(prompt_template)},
+                agent_description = {quote(description)},
+                agent_attributes = {quote(attributes_json)};
+            """
+
+def create_agents_table_query() -> str:
+    return f"""
+            CREATE TABLE IF NOT EXISTS {AGENTS_TABLE} (
+                id VARCHAR(255) PRIMARY KEY,
+                name VARCHAR(255),
+                description TEXT,
+                age INT,
+                gender VARCHAR(50),
+                occupation VARCHAR(255),
+                income_level VARCHAR(100),
+                education_level VARCHAR(100),
+                interests TEXT,
+                personality_traits TEXT,
+                buying_preferences TEXT,
+                ml_engine_id VARCHAR(255),
+                purchase_behaviors TEXT,
+                purchase_frequency VARCHAR(50),
+                communication_preferences TEXT,
+                location VARCHAR(255),
+                social_media_usage TEXT,
+                brand_loyalty INT,
+                price_sensitivity INT,
+                tech_savviness INT,
+                created_at DATETIME
+            );
+            """
+
+def _agent_values(agent: Agent) -> str:
+    row = agent.dict(exclude={"updated_at"})
+    values = []
+    for column, value in row.items():
+        if value is None:
+            values.append("NULL")
+        elif column in AGENT_JSON_COLUMNS:
+            values.append(quote(json.dumps(value, default=str)))
+        elif isinstance(value, int):
+            values.append(str(value))
+        elif isinstance(value, datetime):
+            values.append(quote(value.isoformat()))
+        else:
+            values.append(quote(getattr(value, "value", value)))
+    return f"({', '.join(values)})"
+
+def insert_agent_query(agent: Agent) -> str:
+    """Store an agent profile row alongside its model"""
+    return insert_agents_query([agent])
+
+def insert_agents_query(agents: List[Agent]) -> str:
+    """Store several agent profile rows with one statement"""
+    columns = [column for column in Agent.model_fields if column != "updated_at"]
+    rows = ",\n                   ".join(_agent_values(agent) for agent in agents)
+    return f"""
+            INSERT INTO {AGENTS_TABLE} ({', '.join(columns)})
+            VALUES {rows};
+            """
+
+def select_agent_query(agent_id: str) -> str:
+    return f"SELECT * FROM {AGENTS_TABLE} WHERE id = {quote(agent_id)};"
+
+def decode_agent_row(row: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Decode a row of the agents table's JSON columns, ready for validation"""
+    data = dict(row)
+    for column in AGENT_JSON_COLUMNS:
+        if isinstance(data.get(column), str):
+            data[column] = loads(data[column])
+    if not data.get("created_at"):
+        data["created_at"] = now or datetime.now()
+    return data
+
+def agent_from_row(row: Dict[str, Any]) -> Agent:
+    """Build an Agent from a row of the agents table"""
+    return Agent(**decode_agent_row(row))
+
+def _keep_error(value: Any, handler: Callable) -> Any:
+    # Return a row's validation error in its place instead of failing the whole list
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+# Validates a list of agent rows in one pass, one Agent or ValidationError per row
+AGENT_ROWS = List[Annotated[Agent, WrapValidator(_keep_error)]]
+
+def agents_from_rows(rows: Iterable[Dict[str, Any]]) -> Tuple[List[Agent], List[Tuple[Any, str]]]:
+    """
+    Build Agents from a whole result set, validated in one pass by a cached
+    TypeAdapter. Rows that don't decode or validate are left out and
+    returned as (id, error) instead of failing the rest.
+    """
+    with gc_paused():
+        now = datetime.now()
+        decoded, invalid = [], []
+        for row in rows:
+            try:
+                decoded.append(decode_agent_row(row, now))
+            except ValueError as e:
+                invalid.append((row.get("id"), f"Invalid JSON column: {str(e)}"))
+
+        agents = []
+        for data, result in zip(decoded, type_adapter(AGENT_ROWS).validate_python(decoded)):
+            if isinstance(result, ValidationError):
+                invalid.append((data.get("id"), "; ".join(
+                    f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+                    for detail in result.errors()
+                )))
+            else:
+                agents.append(result)
+        return agents, invalid
+
+def list_legacy_agent_models_query() -> str:
+    """Models in the project, with the USING options they were created with"""
+    return f"""
+            SELECT name, training_options
+            FROM information_schema.models
+            WHERE project = {quote(PROJECT)};
+            """
+
+def _training_options_using(training_options: Any) -> Optional[Dict[str, Any]]:
+    """A model's USING options from its training options, if they can be read"""
+    options = training_options
+    if isinstance(options, str):
+        try:
+            options = json.loads(options)
+        except ValueError:
+            try:
+                options = ast.literal_eval(options)
+            except (ValueError, SyntaxError):
+                return None
+    if not isinstance(options, dict):
+        return None
+    using = options.get("using", options)
+    return using if isinstance(using, dict) else None
+
+def prompt_template_from_training_options(training_options: Any) -> Optional[str]:
+    """The prompt template a model was created with, if present"""
+    using = _training_options_using(training_options)
+    template = using.get("prompt_template") if using else None
+    return template if isinstance(template, str) else None
+
+def agent_attributes_from_training_options(training_options: Any) -> Optional[Dict[str, Any]]:
+    """Recover agent_attributes from a model's training options, if present"""
+    using = _training_options_using(training_options)
+    attributes = using.get("agent_attributes") if using else None
+    if isinstance(attributes, str):
+        try:
+            attributes = json.loads(attributes)
+        except ValueError:
+            return None
+    if not isinstance(attributes, dict):
+        return None
+
+    attributes = dict(attributes)
+    if using.get("engine"):
+        attributes.setdefault("ml_engine_id", using["engine"])
+    return attributes
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    # b64decode only rejects stray characters with validate=True; urlsafe_b64decode drops them
+    try:
+        last_id = base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if not last_id:
+        raise ValueError("Invalid cursor")
+    return last_id
+
+def list_query(table: str, columns: Tuple[str, ...], list_query: ListQuery) -> str:
+    """
+    SELECT for one page of a listing, with filters pushed into the WHERE clause.
+    Pages are keyed on id; one extra row is fetched to tell whether a next page exists.
+    """
+    for column in list(list_query.equals) + list(list_query.ranges) + (list_query.fields or []):
+        if column not in columns:
+            raise ValueError(f"Unknown field: {column}")
+
+    # The id is always needed to build the next cursor
+    if list_query.fields:
+        selected = ["id"] + [field for field in list_query.fields if field != "id"]
+    else:
+        selected = ["*"]
+
+    conditions = [f"{column} = {quote(value)}" for column, value in list_query.equals.items()]
+    for column, (minimum, maximum) in list_query.ranges.items():
+        if minimum is not None:
+            conditions.append(f"{column} >= {int(minimum)}")
+        if maximum is not None:
+            conditions.append(f"{column} <= {int(maximum)}")
+    if list_query.after:
+        conditions.append(f"id > {quote(decode_cursor(list_query.after))}")
+
+    query = f"SELECT {', '.join(selected)} FROM {table}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY id"
+    if list_query.limit:
+        query += f" LIMIT {list_query.limit + 1}"
+    return query + ";"
+
+def page(rows: List[Dict[str, Any]], list_query: ListQuery) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page"""
+    if list_query.limit and len(rows) > list_query.limit:
+        rows = rows[:list_query.limit]
+        return rows, encode_cursor(str(rows[-1]["id"]))
+    return rows, None
+
+def project(row: Dict[str, Any], list_query: ListQuery) -> Dict[str, Any]:
+    """Decode JSON columns and keep only the requested fields"""
+    row = dict(row)
+    for column in AGENT_JSON_COLUMNS:
+        if isinstance(row.get(column), str):
+            row[column] = loads(row[column])
+    if list_query.fields:
+        row = {field: row.get(field) for field in list_query.fields}
+    return row
+
+def create_campaigns_table_query() -> str:
+    return f"""
+            CREATE TABLE IF NOT EXISTS {CAMPAIGNS_TABLE} (
+                id VARCHAR(255) PRIMARY KEY,
+                name VARCHAR(255),
+                description TEXT,
+                target_audience VARCHAR(255),
+                budget VARCHAR(100),
+                marketing_channel VARCHAR(100),
+                message_type VARCHAR(50),
+                content TEXT,
+                created_at DATETIME
+            );
+            """
+
+def campaign_id(campaign_name: str) -> str:
+    return f"campaign_{campaign_name}"
+
+def insert_campaign_query(campaign: Campaign) -> str:
+    return f"""
+            INSERT INTO {CAMPAIGNS_TABLE} (
+                id, name, description, target_audience, budget,
+                marketing_channel, message_type, content, created_at
+            ) VALUES (
+                {quote(campaign.id)},
+                {quote(campaign.name)},
+                {quote(campaign.description)},
+                {quote(campaign.target_audience)},
+                {quote(campaign.budget)},
+                {quote(campaign.marketing_channel)},
+                {quote(campaign.message_type)},
+                {quote(campaign.content)},
+                {quote(campaign.created_at.isoformat())}
+            );
+            """
+
+def select_campaign_query(campaign_id: str) -> str:
+    return f"SELECT * FROM {CAMPAIGNS_TABLE} WHERE id = {quote(campaign_id)};"
+
+def campaign_from_row(row: Dict[str, Any]) -> Campaign:
+    """Build a Campaign from a row of the campaigns table (or a legacy campaign_* table)"""
+    campaign_id = row['id']
+    created_at = row.get('created_at')
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return Campaign(
+        id=campaign_id,
+        name=row.get('name') or campaign_id.replace('campaign_', '').replace('_', ' ').title(),
+        description=row.get('description') or "",
+        target_audience=row.get('target_audience') or "",
+        budget=row.get('budget') or "",
+        marketing_channel=row.get('marketing_channel') or "",
+        message_type=row.get('message_type') or "informational",
+        content=row.get('content') or "",
+        created_at=created_at or datetime.now()
+    )
+
+def evaluate_agents_query(campaign_id: str, agent_ids: List[str]) -> str:
+    """
+    Predict the responses of several agent models to one campaign in a single
+    statement: one campaign JOIN model per agent, combined with UNION ALL.
+    """
+    selects = [
+        f"""SELECT {quote(agent_id)} AS agent_id, m.response AS response
+            FROM {CAMPAIGNS_TABLE} AS c
+            JOIN {PROJECT}.{agent_id} AS m
+            WHERE c.id = {quote(campaign_id)}"""
+        for agent_id in agent_ids
+    ]
+    return "\n            UNION ALL\n            ".join(selects) + ";"
@@ -0,0 +1,69 @@
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+from app.config import MINDSDB_SETUP_RETRY_BASE_DELAY, MINDSDB_SETUP_RETRY_MAX_DELAY
+from app.services.async_mindsdb_service import AsyncMindsDBService
+from app.utils.mindsdb_http import AsyncMindsDBClient
+
+logger = logging.getLogger(__name__)
+
+class MindsDBSetup:
+    """
+    Creates the project database and tables in the background so startup
+    doesn't wait on MindsDB. Retries with jittered exponential backoff until
+    it succeeds; the readiness probe reports its progress.
+    """
+
+    def __init__(
+        self,
+        client: AsyncMindsDBClient,
+        retry_base_delay: float = MINDSDB_SETUP_RETRY_BASE_DELAY,
+        retry_max_delay: float = MINDSDB_SETUP_RETRY_MAX_DELAY,
+    ):
+        self.client = client
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.ready = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.completed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, on_ready: Optional[Callable[[], Any]] = None):
+        """Run setup in the background, calling `on_ready` once it succeeds"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(on_ready))
+
+    async def _run(self, on_ready: Optional[Callable[[], Any]]):
+        while not self.ready:
+            self.attempts += 1
+            try:
+                logger.info("Setting up MindsDB...")
+                await AsyncMindsDBService(self.client).ensure_schema()
+                self.ready = True
+                self.error = None
+                self.completed_at = time.time()
+                logger.info("MindsDB setup completed")
+            except Exception as e:
+                self.error = str(e)
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (self.attempts - 1)))
+                logger.error(f"Error setting up MindsDB (attempt {self.attempts}), retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+        if on_ready is not None:
+            on_ready()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "setup_complete": self.ready,
+            "setup_attempts": self.attempts,
+            "connected": self.client.connected,
+            "circuit": self.client.breaker.state,
+            "error": self.error if not self.ready else self.client.last_error,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,97 @@
+import logging
+from typing import Dict, List
+import numpy as np
+from app.models.agent import AgentCreate, CommunicationPreference, PurchaseFrequency
+from app.models.population import CategoricalSpec, MultiLabelSpec, NumericSpec, PopulationSpec
+from app.utils.serialization import gc_paused
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = ("age", "brand_loyalty", "price_sensitivity", "tech_savviness")
+CATEGORICAL_FIELDS = ("gender", "occupation", "income_level", "education_level", "location", "purchase_frequency")
+MULTI_LABEL_FIELDS = ("interests", "personality_traits", "social_media_usage", "purchase_behaviors", "communication_preferences")
+
+# Fields typed as enums on AgentBase; model_construct skips coercion so members are built here
+ENUM_FIELDS = {"purchase_frequency": PurchaseFrequency, "communication_preferences": CommunicationPreference}
+
+def _probabilities(spec: CategoricalSpec) -> np.ndarray:
+    weights = np.fromiter(spec.weights.values(), dtype=float, count=len(spec.weights))
+    return weights / weights.sum()
+
+def sample_numeric(rng: np.random.Generator, spec: NumericSpec, size: int) -> np.ndarray:
+    """Draw integers in [low, high] from the spec's distribution"""
+    if spec.distribution == "normal":
+        mean = spec.mean if spec.mean is not None else (spec.low + spec.high) / 2
+        std = spec.std if spec.std is not None else max((spec.high - spec.low) / 6, 0.5)
+        values = rng.normal(mean, std, size)
+    elif spec.distribution == "beta":
+        values = spec.low + (spec.high - spec.low) * rng.beta(spec.a, spec.b, size)
+    else:
+        values = rng.uniform(spec.low - 0.5, spec.high + 0.5, size)
+    return np.clip(np.rint(values), spec.low, spec.high).astype(np.int64)
+
+def sample_categorical(rng: np.random.Generator, spec: CategoricalSpec, size: int) -> np.ndarray:
+    """Draw one value index per agent"""
+    return rng.choice(len(spec.weights), size=size, p=_probabilities(spec))
+
+def sample_multi_label(rng: np.random.Generator, spec: MultiLabelSpec, size: int):
+    """
+    Draw distinct values per agent, weighted, without replacement. Adding Gumbel
+    noise to the log weights and taking the top k is equivalent to sequential
+    weighted sampling, and does the whole population in one sort.
+    """
+    probabilities = _probabilities(spec)
+    max_items = min(spec.max_items, int((probabilities > 0).sum()))
+    counts = rng.integers(min(spec.min_items, max_items), max_items + 1, size=size)
+    with np.errstate(divide="ignore"):
+        keys = np.log(probabilities) + rng.gumbel(size=(size, len(probabilities)))
+    order = np.argsort(-keys, axis=1)[:, :max_items]
+    return order, counts
+
+def generate_population(spec: PopulationSpec) -> List[AgentCreate]:
+    """
+    Sample a whole audience at once and materialize it as AgentCreate objects.
+    Values are valid by construction, so objects are built without re-validation.
+    """
+    with gc_paused():
+        return _generate_population(spec)
+
+def _generate_population(spec: PopulationSpec) -> List[AgentCreate]:
+    rng = np.random.default_rng(spec.seed)
+    size = spec.size
+    columns: Dict[str, list] = {}
+
+    for field in NUMERIC_FIELDS:
+        field_spec = getattr(spec, field)
+        if field_spec is not None:
+            columns[field] = sample_numeric(rng, field_spec, size).tolist()
+
+    for field in CATEGORICAL_FIELDS:
+        field_spec = getattr(spec, field)
+        if field_spec is not None:
+            labels = list(field_spec.weights)
+            if field in ENUM_FIELDS:
+                labels = [ENUM_FIELDS[field](label) for label in labels]
+            columns[field] = np.array(labels, dtype=object)[sample_categorical(rng, field_spec, size)].tolist()
+
+    for field in MULTI_LABEL_FIELDS:
+        field_spec = getattr(spec, field)
+        if field_spec is not None:
+            labels = list(field_spec.weights)
+            if field in ENUM_FIELDS:
+                labels = [ENUM_FIELDS[field](label) for label in labels]
+            order, counts = sample_multi_label(rng, field_spec, size)
+            selected = np.array(labels, dtype=object)[order].tolist()
+            columns[field] = [row[:count] for row, count in zip(selected, counts.tolist())]
+
+    columns["name"] = [f"{spec.name_prefix} {number}" for number in range(1, size + 1)]
+    columns["ml_engine_id"] = [spec.ml_engine_id] * size
+    # Fields not sampled are filled with their defaults by model_construct
+    fields = tuple(columns)
+    fields_set = set(fields)
+    agents = [
+        AgentCreate.model_construct(_fields_set=fields_set, **dict(zip(fields, row)))
+        for row in zip(*columns.values())
+    ]
+    logger.info(f"Generated population of {size} agents (seed {spec.seed})")
+    return agents
@@ -0,0 +1,97 @@
+import re
+from typing import List, NamedTuple, Optional
+from app.config import PROMPT_LAYOUT, AGENT_RESPONSE_FORMAT
+from app.models.agent import AgentCreate
+
+# Agent prompt templates. In the cache-friendly layout every prompt starts
+# with the same instructions, then the agent's persona, then the campaign,
+# so provider prompt caches see a prefix shared by all agents and a longer
+# one shared by every evaluation of the same agent.
+
+PROMPT_LAYOUTS = ("cache_friendly", "legacy")
+
+# "text" asks for prose ending in a 1-10 rating; "json" asks for a fixed
+# object (see StructuredResponse) so scoring is a parse, not a regex search
+RESPONSE_FORMATS = ("text", "json")
+
+ROLE = "You are roleplaying as the person described in the profile below.\n"
+
+LEGACY_INSTRUCTIONS = """When presented with a marketing campaign, respond as this person would.
+Evaluate the campaign based on your interests, needs, and preferences.
+Explain why you would or would not be interested in the product or service.
+Rate your likelihood to engage with this campaign on a scale of 1-10.
+"""
+
+JSON_INSTRUCTIONS = """When presented with a marketing campaign, evaluate it as this person would,
+based on your interests, needs, and preferences.
+Respond with only a JSON object, no other text, in exactly this form:
+{"score": <likelihood to engage with this campaign, an integer from 1 to 10>, "sentiment": "positive" | "neutral" | "negative", "reasons": [<up to 3 short reasons, in this person's voice>]}
+"""
+
+INSTRUCTIONS = ROLE + LEGACY_INSTRUCTIONS
+
+# Filled in by MindsDB from the campaign row joined with the agent model
+CAMPAIGN_PROMPT_SECTION = """
+Campaign: {{name}}
+Channel: {{marketing_channel}}
+Message Type: {{message_type}}
+Description: {{description}}
+Content: {{content}}
+"""
+
+# Rough BPE token boundaries: words, numbers and individual punctuation marks
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+class PromptSegment(NamedTuple):
+    name: str
+    text: str
+    # Identical across the evaluations that share this prefix, so worth a
+    # provider cache breakpoint (Anthropic cache_control) at its end
+    cacheable: bool
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count; close to the BPE tokenizers for English prose"""
+    return len(TOKEN_PATTERN.findall(text))
+
+def persona_section(agent: AgentCreate) -> str:
+    return f"""Name: {agent.name}
+Age: {agent.age if agent.age else "Not specified"}
+Gender: {agent.gender if agent.gender else "Not specified"}
+Occupation: {agent.occupation if agent.occupation else "Not specified"}
+Income Level: {agent.income_level if agent.income_level else "Not specified"}
+Education Level: {agent.education_level if agent.education_level else "Not specified"}
+Location: {agent.location}
+Interests: {', '.join(agent.interests) if agent.interests else "Not specified"}
+Personality Traits: {', '.join(agent.personality_traits) if agent.personality_traits else "Not specified"}
+Purchase Behaviors: {', '.join(agent.purchase_behaviors)}
+Purchase Frequency: {getattr(agent.purchase_frequency, 'value', agent.purchase_frequency)}
+Brand Loyalty (1-10): {agent.brand_loyalty}
+Price Sensitivity (1-10): {agent.price_sensitivity}
+Tech Savviness (1-10): {agent.tech_savviness}
+"""
+
+def agent_prompt_segments(agent: AgentCreate, layout: Optional[str] = None,
+                          response_format: Optional[str] = None) -> List[PromptSegment]:
+    """The agent's prompt template as ordered segments"""
+    layout = layout or PROMPT_LAYOUT
+    response_format = response_format or AGENT_RESPONSE_FORMAT
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Unknown response format: {response_format}")
+    instructions = JSON_INSTRUCTIONS if response_format == "json" else LEGACY_INSTRUCTIONS
+    if layout == "legacy":
+        return [
+            PromptSegment("persona", "You are roleplaying as a person with the following characteristics:\n\n" + persona_section(agent), False),
+            PromptSegment("instructions", "\n" + instructions, False),
+            PromptSegment("campaign", CAMPAIGN_PROMPT_SECTION, False),
+        ]
+    if layout != "cache_friendly":
+        raise ValueError(f"Unknown prompt layout: {layout}")
+    return [
+        PromptSegment("instructions", ROLE + instructions + "\nProfile:\n", True),
+        PromptSegment("persona", persona_section(agent), True),
+        PromptSegment("campaign", CAMPAIGN_PROMPT_SECTION, False),
+    ]
+
+def generate_agent_prompt(agent: AgentCreate, layout: Optional[str] = None, response_format: Optional[str] = None) -> str:
+    """Generate a prompt template for the agent based on its attributes"""
+    return "".join(segment.text for segment in agent_prompt_segments(agent, layout, response_format))
@@ -0,0 +1,165 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from app.config import DATA_DIR, RESPONSE_CACHE_MEMORY_SIZE, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    Cache of agent responses to campaigns.
+
+    An in-memory LRU sits in front of a SQLite file. Entries expire after
+    `ttl` seconds, and the least recently used entries are evicted once the
+    file holds more than `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        memory_size: int = RESPONSE_CACHE_MEMORY_SIZE,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = RESPONSE_CACHE_TTL,
+    ):
+        self.path = path or os.path.join(DATA_DIR, "response_cache.sqlite3")
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(prompt: str, campaign_content: str, engine_id: str, model_version: Optional[str] = None) -> str:
+        """Key an evaluation by the rendered prompt, the campaign content and the engine/model"""
+        parts = (_digest(prompt), _digest(campaign_content), engine_id or "", model_version or "")
+        return _digest("\x1f".join(parts))
+
+    def _remember(self, key: str, response: str, created_at: float):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Look up several keys at once, returning only the hits"""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        hits: Dict[str, str] = {}
+
+        with self._lock:
+            remaining = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    hits[key] = entry[0]
+                    self.counters["memory_hits"] += 1
+                else:
+                    remaining.append(key)
+
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(remaining), 500):
+                chunk = remaining[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, response, created_at FROM responses WHERE key IN ({placeholders}) AND created_at > ?",
+                    (*chunk, now - self.ttl),
+                ).fetchall()
+                for key, response, created_at in rows:
+                    hits[key] = response
+                    self._remember(key, response, created_at)
+                    self.counters["disk_hits"] += 1
+                if rows:
+                    self._db.executemany(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key, _, _ in rows],
+                    )
+                    self._db.commit()
+
+            self.counters["misses"] += len(keys) - len(hits)
+        return hits
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: Dict[str, str]):
+        """Store several responses at once"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, response in items.items():
+                self._remember(key, response, now)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, response, now, now) for key, response in items.items()],
+            )
+            self._db.commit()
+            self.counters["writes"] += len(items)
+            self._writes_since_eviction += len(items)
+
+            # Evicting needs a count, so only do it every so often
+            if self._writes_since_eviction >= max(1, self.max_entries // 100):
+                self._evict(now)
+                self._writes_since_eviction = 0
+
+    def set(self, key: str, response: str):
+        self.set_many({key: response})
+
+    def _evict(self, now: float):
+        expired = self._db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+        self._db.commit()
+        evicted = expired + max(0, overflow)
+        if evicted:
+            self.counters["evictions"] += evicted
+            logger.info(f"Evicted {evicted} cached responses")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+            return {**self.counters, "memory_entries": len(self._memory), "disk_entries": entries}
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
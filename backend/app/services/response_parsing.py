@@ -0,0 +1,70 @@
+import re
+import json
+from typing import List, NamedTuple, Optional
+from pydantic import TypeAdapter, ValidationError
+from app.models.evaluation import StructuredResponse
+
+# Turning agent responses into scores. Agents created with the "json" response
+# format answer with a StructuredResponse object, validated by an adapter built
+# once at import; prose answers from older agents fall back to regexes.
+
+STRUCTURED_RESPONSE = TypeAdapter(StructuredResponse)
+
+# Patterns for the 1-10 engagement rating agents are asked to give, most specific first
+SCORE_PATTERNS = [
+    re.compile(r"\b(10|[1-9])\s*(?:/|out of)\s*10\b", re.IGNORECASE),
+    re.compile(r"(?:rate|rating|score|likelihood)[^0-9]{0,60}\b(10|[1-9])\b", re.IGNORECASE),
+]
+
+# Common ways models break JSON: code fences, smart quotes, trailing commas
+CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+class ParsedResponse(NamedTuple):
+    score: Optional[int] = None
+    sentiment: Optional[str] = None
+    reasons: Optional[List[str]] = None
+
+def parse_score(response: Optional[str]) -> Optional[int]:
+    """Extract the 1-10 engagement rating from an agent's free-text response"""
+    if not response:
+        return None
+    for pattern in SCORE_PATTERNS:
+        match = pattern.search(response)
+        if match:
+            return int(match.group(1))
+    return None
+
+def repair_json(text: str) -> str:
+    """One cheap pass over the usual JSON mistakes; no second model call"""
+    text = CODE_FENCE.sub("", text.strip()).translate(SMART_QUOTES)
+    # Drop any prose around the object
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    text = TRAILING_COMMA.sub(r"\1", text)
+    if '"' not in text:
+        text = text.replace("'", '"')
+    return text
+
+def parse_structured(response: str) -> Optional[StructuredResponse]:
+    """Validate a structured response, repairing it once if it's malformed"""
+    try:
+        return STRUCTURED_RESPONSE.validate_json(response)
+    except ValidationError:
+        pass
+    try:
+        return STRUCTURED_RESPONSE.validate_python(json.loads(repair_json(response)))
+    except (ValueError, ValidationError):
+        return None
+
+def parse_response(response: Optional[str]) -> ParsedResponse:
+    """Score (plus sentiment and reasons when structured) of an agent response"""
+    if not response:
+        return ParsedResponse()
+    if "{" in response:
+        structured = parse_structured(response)
+        if structured is not None:
+            return ParsedResponse(structured.score, structured.sentiment, structured.reasons)
+    return ParsedResponse(score=parse_score(response))
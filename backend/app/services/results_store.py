@@ -0,0 +1,254 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.config import DATA_DIR, ENGAGEMENT_SCORE_THRESHOLD
+
+# Agent attributes copied onto every evaluation row so group-bys need no join
+AGENT_ATTRIBUTE_COLUMNS = (
+    "age", "gender", "occupation", "income_level", "education_level", "location",
+    "purchase_frequency", "brand_loyalty", "price_sensitivity", "tech_savviness",
+)
+INTEGER_ATTRIBUTES = ("age", "brand_loyalty", "price_sensitivity", "tech_savviness")
+
+# Columns analytics can group by; age_band is derived from age
+GROUP_COLUMNS = ("campaign_id", "ml_engine_id", "agent_id", *AGENT_ATTRIBUTE_COLUMNS, "age_band")
+
+# Columns loaded into memory for every aggregation
+NUMERIC_COLUMNS = ("score", "latency_ms", "cached", "failed")
+
+class ResultsStore:
+    """
+    Every evaluation ever run, one row each, in SQLite.
+
+    Aggregations read a campaign's columns once into NumPy arrays, with group
+    columns encoded as integer codes, and only read the rows added since on
+    later calls, so repeated dashboard queries are bincounts over memory even
+    while a job is writing. Raw responses live in a separate table to keep
+    the scanned one narrow.
+    """
+
+    def __init__(self, path: str = None, engagement_threshold: int = ENGAGEMENT_SCORE_THRESHOLD):
+        self.path = path or os.path.join(DATA_DIR, "results.sqlite3")
+        self.engagement_threshold = engagement_threshold
+        self._lock = threading.Lock()
+        self._columns: Dict[Optional[str], Dict[str, Any]] = {}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS evaluations (
+                id INTEGER PRIMARY KEY,
+                campaign_id TEXT NOT NULL,
+                agent_id TEXT NOT NULL,
+                ml_engine_id TEXT,
+                score INTEGER,
+                latency_ms REAL,
+                prompt_tokens INTEGER,
+                response_tokens INTEGER,
+                cached INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                {", ".join(f"{column} {'INTEGER' if column in INTEGER_ATTRIBUTES else 'TEXT'}" for column in AGENT_ATTRIBUTE_COLUMNS)}
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS evaluation_responses (
+                evaluation_id INTEGER PRIMARY KEY REFERENCES evaluations (id),
+                response TEXT
+            )
+            """
+        )
+        for columns in (("campaign_id",), ("agent_id",), ("campaign_id", "income_level"), ("campaign_id", "gender"), ("campaign_id", "location")):
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS evaluations_{'_'.join(columns)} ON evaluations ({', '.join(columns)})"
+            )
+        self._db.commit()
+        (self._max_id,) = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM evaluations").fetchone()
+
+    def add_many(self, records: Iterable[Dict[str, Any]]):
+        """
+        Store evaluation records: campaign_id, agent_id, ml_engine_id, score,
+        latency_ms, prompt_tokens, response_tokens, cached, error, response and
+        the agent attribute columns.
+        """
+        records = [{"cached": False, **record} for record in records]
+        if not records:
+            return
+        now = time.time()
+        columns = (
+            "campaign_id", "agent_id", "ml_engine_id", "score", "latency_ms",
+            "prompt_tokens", "response_tokens", "cached", "error", *AGENT_ATTRIBUTE_COLUMNS,
+        )
+        with self._lock:
+            (last_id,) = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM evaluations").fetchone()
+            ids = range(last_id + 1, last_id + 1 + len(records))
+            self._db.executemany(
+                f"INSERT INTO evaluations (id, created_at, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 2))})",
+                [
+                    (evaluation_id, now, *(_column_value(record.get(column)) for column in columns))
+                    for evaluation_id, record in zip(ids, records)
+                ],
+            )
+            self._db.executemany(
+                "INSERT INTO evaluation_responses (evaluation_id, response) VALUES (?, ?)",
+                [(evaluation_id, record.get("response")) for evaluation_id, record in zip(ids, records)],
+            )
+            self._db.commit()
+            self._max_id = ids[-1]
+
+    def _load(self, campaign_id: Optional[str]) -> Dict[str, Any]:
+        """
+        A campaign's (or all) numeric result columns. Cached columns are
+        extended with the rows added since they were read; group columns are
+        added on first use by _codes.
+        """
+        with self._lock:
+            columns = self._columns.get(campaign_id)
+            if columns is None:
+                columns = {name: np.empty(0) for name in NUMERIC_COLUMNS}
+                columns["max_id"] = 0
+                columns["groups"] = {}
+            if columns["max_id"] < self._max_id:
+                columns = self._extend(columns, campaign_id, self._max_id)
+                self._columns[campaign_id] = columns
+            return columns
+
+    def _extend(self, columns: Dict[str, Any], campaign_id: Optional[str], max_id: int) -> Dict[str, Any]:
+        # A new dict rather than in-place appends, so callers still holding the
+        # old columns keep arrays that line up row for row
+        after = columns["max_id"]
+        rows = self._select("score, latency_ms, cached, error IS NOT NULL", campaign_id, after, max_id)
+        values = list(zip(*rows)) if rows else [()] * len(NUMERIC_COLUMNS)
+        # NaN marks missing scores and latencies
+        extended = {
+            name: np.concatenate((columns[name], np.array(column, dtype=float)))
+            for name, column in zip(NUMERIC_COLUMNS, values)
+        }
+        extended["max_id"] = max_id
+        extended["groups"] = {}
+        for name, (index, codes) in columns["groups"].items():
+            index = dict(index)
+            new_codes = self._encode(index, self._group_values(name, campaign_id, after, max_id))
+            extended["groups"][name] = (index, np.concatenate((codes, new_codes)))
+        return extended
+
+    def _select(self, expression: str, campaign_id: Optional[str], after_id: int, max_id: int) -> List[Tuple]:
+        # Bounded by max_id so columns loaded at different times line up row for row
+        query = f"SELECT {expression} FROM evaluations WHERE id > ? AND id <= ?"
+        params: Tuple = (after_id, max_id)
+        if campaign_id is not None:
+            query += " AND campaign_id = ?"
+            params += (campaign_id,)
+        return self._db.execute(query + " ORDER BY id", params).fetchall()
+
+    def _group_values(self, name: str, campaign_id: Optional[str], after_id: int, max_id: int) -> List[Any]:
+        if name == "age_band":
+            return [
+                None if age is None else f"{age // 10 * 10}-{age // 10 * 10 + 9}"
+                for (age,) in self._select("age", campaign_id, after_id, max_id)
+            ]
+        return [row[0] for row in self._select(name, campaign_id, after_id, max_id)]
+
+    @staticmethod
+    def _encode(index: Dict[Any, int], values: List[Any]) -> np.ndarray:
+        return np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+
+    def _codes(self, columns: Dict[str, Any], campaign_id: Optional[str], name: str) -> Tuple[List[Any], np.ndarray]:
+        """A group column as distinct values and one integer code per row"""
+        with self._lock:
+            cached = columns["groups"].get(name)
+            if cached is None:
+                index: Dict[Any, int] = {}
+                codes = self._encode(index, self._group_values(name, campaign_id, 0, columns["max_id"]))
+                cached = columns["groups"][name] = (index, codes)
+            index, codes = cached
+            return list(index), codes
+
+    def summary(self, campaign_id: Optional[str] = None) -> Dict[str, Any]:
+        """Totals, score statistics and the score distribution"""
+        columns = self._load(campaign_id)
+        scores = columns["score"]
+        scored = ~np.isnan(scores)
+        latencies = columns["latency_ms"][~np.isnan(columns["latency_ms"])]
+        distribution = np.bincount(scores[scored].astype(np.int64), minlength=11)[1:]
+        return {
+            "campaign_id": campaign_id,
+            "evaluations": int(len(scores)),
+            "scored": int(scored.sum()),
+            "failed": int(columns["failed"].sum()),
+            "cached": int(columns["cached"].sum()),
+            "campaigns": len(self._codes(columns, campaign_id, "campaign_id")[0]),
+            "agents": len(self._codes(columns, campaign_id, "agent_id")[0]),
+            "average_score": _mean(scores[scored]),
+            "engagement_rate": _mean(scores[scored] >= self.engagement_threshold),
+            "average_latency_ms": _mean(latencies),
+            "score_distribution": {score: int(count) for score, count in enumerate(distribution, start=1) if count},
+        }
+
+    def group_scores(self, group_by: str, campaign_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Score statistics per value of `group_by`, computed with vectorized bincounts"""
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Can't group by {group_by}; use one of: {', '.join(GROUP_COLUMNS)}")
+        columns = self._load(campaign_id)
+        if not len(columns["score"]):
+            return []
+
+        groups, codes = self._codes(columns, campaign_id, group_by)
+        size = len(groups)
+        scores = columns["score"]
+        scored = ~np.isnan(scores)
+        filled = np.where(scored, scores, 0.0)
+        latency = columns["latency_ms"]
+        timed = ~np.isnan(latency)
+
+        counts = np.bincount(codes, minlength=size)
+        scored_counts = np.bincount(codes, weights=scored, minlength=size)
+        sums = np.bincount(codes, weights=filled, minlength=size)
+        squares = np.bincount(codes, weights=filled * filled, minlength=size)
+        engaged = np.bincount(codes, weights=filled >= self.engagement_threshold, minlength=size)
+        failed = np.bincount(codes, weights=columns["failed"], minlength=size)
+        latency_sums = np.bincount(codes, weights=np.where(timed, latency, 0.0), minlength=size)
+        latency_counts = np.bincount(codes, weights=timed, minlength=size)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / scored_counts
+            stds = np.sqrt(np.maximum(squares / scored_counts - means * means, 0))
+            engagement = engaged / scored_counts
+            latencies = latency_sums / latency_counts
+
+        return [
+            {
+                "value": None if groups[index] is None else str(groups[index]),
+                "evaluations": int(counts[index]),
+                "scored": int(scored_counts[index]),
+                "failed": int(failed[index]),
+                "average_score": _float(means[index]),
+                "score_std": _float(stds[index]),
+                "engagement_rate": _float(engagement[index]),
+                "average_latency_ms": _float(latencies[index]),
+            }
+            for index in np.argsort(-counts, kind="stable")
+        ]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def _column_value(value: Any) -> Any:
+    # Enum members (e.g. PurchaseFrequency) are stored by value
+    return getattr(value, "value", value)
+
+def _float(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    return round(float(values.mean()), 4) if len(values) else None
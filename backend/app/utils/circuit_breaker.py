@@ -0,0 +1,136 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, Tuple, Type
+from app.config import (
+    MINDSDB_BREAKER_FAILURE_THRESHOLD,
+    MINDSDB_BREAKER_RESET_TIMEOUT,
+    MINDSDB_BREAKER_MAX_RESET_TIMEOUT,
+)
+from app.utils.metrics import MINDSDB_CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+# Gauge values for each state
+STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling MindsDB while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"MindsDB is unavailable ({name} circuit open, next probe in {retry_after:.1f}s)")
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Fails calls fast after repeated connection failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    raise CircuitOpenError without touching the network. Once the reset
+    timeout passes, a single caller is let through as a probe (half-open)
+    while everyone else keeps failing fast; its success closes the circuit,
+    its failure reopens it with the timeout doubled (with jitter, up to
+    `max_reset_timeout`). Thread-safe, so sync and async callers can share one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = MINDSDB_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = MINDSDB_BREAKER_RESET_TIMEOUT,
+        max_reset_timeout: float = MINDSDB_BREAKER_MAX_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_count = 0  # Consecutive openings, for the backoff
+        self.retry_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        MINDSDB_CIRCUIT_STATE.labels(name).set(STATES["closed"])
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"MindsDB circuit {self.name}: {self.state} -> {state}")
+            self.state = state
+            MINDSDB_CIRCUIT_STATE.labels(self.name).set(STATES[state])
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless the call may go ahead. Returns True for a probe."""
+        with self._lock:
+            if self.state == "closed":
+                return False
+            now = time.monotonic()
+            if self.state == "open" and now >= self.retry_at:
+                self._set_state("half_open")
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            raise CircuitOpenError(self.name, max(self.retry_at - now, 0))
+
+    def check(self):
+        """Fail fast while open, without claiming the half-open probe"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "open" and now < self.retry_at:
+                raise CircuitOpenError(self.name, self.retry_at - now)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_count = 0
+            self._probing = False
+            self._set_state("closed")
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == "open":
+                # A call that started before the circuit opened
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.opened_count += 1
+                timeout = min(self.max_reset_timeout, self.reset_timeout * 2 ** (self.opened_count - 1))
+                self.retry_at = time.monotonic() + random.uniform(timeout / 2, timeout)
+                self._probing = False
+                self._set_state("open")
+
+    def _abandon_probe(self):
+        # The probe was cancelled before MindsDB answered; let the next caller probe
+        with self._lock:
+            self._probing = False
+
+    @contextmanager
+    def call(self, failure_types: Tuple[Type[BaseException], ...] = (ConnectionError,)):
+        """
+        Guard a block that talks to MindsDB. Exceptions of `failure_types`
+        count as failures; anything else (e.g. a rejected SQL statement) means
+        MindsDB answered.
+        """
+        probe = self.before_call()
+        try:
+            yield
+        except failure_types:
+            self.record_failure()
+            raise
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            if probe:
+                self._abandon_probe()
+            raise
+        except BaseException:
+            self.record_success()
+            raise
+        else:
+            self.record_success()
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the next probe while the circuit is open"""
+        if self.state != "open":
+            return None
+        return max(self.retry_at - time.monotonic(), 0)
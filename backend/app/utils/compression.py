@@ -0,0 +1,111 @@
+import zlib
+import asyncio
+from typing import Optional
+from app.config import COMPRESSION_MIN_SIZE, GZIP_COMPRESSION_LEVEL, BROTLI_COMPRESSION_QUALITY
+
+try:
+    import brotli
+except ImportError:  # Optional; without it clients get gzip
+    brotli = None
+
+# Bodies this large are compressed in a thread so the event loop keeps serving
+THREAD_MIN_SIZE = 256 * 1024
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The best encoding the client accepts: br when available, then gzip"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str, gzip_level: int = GZIP_COMPRESSION_LEVEL,
+             brotli_quality: int = BROTLI_COMPRESSION_QUALITY) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete response bodies of at least
+    `minimum_size` bytes with brotli or gzip, as the client accepts.
+
+    Streamed responses (evaluation events) pass through untouched, as do
+    bodies that are already encoded. A compressed response's ETag becomes
+    weak, since the bytes on the wire differ from the ones it was computed on.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until we know whether the body gets compressed
+                start = message
+                if any(name.lower() == b"content-encoding" for name, _ in message.get("headers", [])):
+                    passthrough = True
+                    await send(start)
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streams and small bodies go out as they are
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_MIN_SIZE:
+                compressed = await asyncio.to_thread(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            response_headers = []
+            for name, value in start.get("headers", []):
+                lower = name.lower()
+                if lower == b"content-length":
+                    continue
+                if lower == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                if lower == b"vary":
+                    continue
+                response_headers.append((name, value))
+            vary = [value for name, value in start.get("headers", []) if name.lower() == b"vary"]
+            response_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", b", ".join(vary + [b"Accept-Encoding"])),
+            ]
+            await send({**start, "headers": response_headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,131 @@
+import re
+import time
+from contextlib import contextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Prometheus metrics for the MindsDB boundary and the API, exposed on /metrics
+
+# Statement kinds used as the `kind` label; anything else is reported as OTHER
+STATEMENT_KINDS = ("SHOW", "DESCRIBE", "CREATE", "SELECT", "INSERT", "DROP", "DELETE", "UPDATE")
+STATEMENT_KIND = re.compile(r"^\s*(\w+)")
+
+# MindsDB statements range from sub-millisecond SHOWs to multi-second predictions
+QUERY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+MINDSDB_QUERY_SECONDS = Histogram(
+    "yaver_mindsdb_query_seconds",
+    "Latency of MindsDB SQL statements",
+    ["kind", "client"],
+    buckets=QUERY_BUCKETS,
+)
+MINDSDB_QUERY_ERRORS = Counter(
+    "yaver_mindsdb_query_errors_total",
+    "MindsDB SQL statements that raised",
+    ["kind", "client"],
+)
+MINDSDB_QUERIES_IN_FLIGHT = Gauge(
+    "yaver_mindsdb_queries_in_flight",
+    "MindsDB SQL statements currently executing",
+    ["client"],
+)
+MINDSDB_CONNECTION_ATTEMPTS = Counter(
+    "yaver_mindsdb_connection_attempts_total",
+    "Attempts to connect to MindsDB, by credential strategy",
+    ["client", "strategy"],
+)
+MINDSDB_CONNECTION_FAILURES = Counter(
+    "yaver_mindsdb_connection_failures_total",
+    "Failed attempts to connect to MindsDB, by credential strategy",
+    ["client", "strategy"],
+)
+MINDSDB_CIRCUIT_STATE = Gauge(
+    "yaver_mindsdb_circuit_state",
+    "MindsDB circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["breaker"],
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "yaver_http_request_seconds",
+    "Latency of API requests, until the last byte of the response is sent",
+    ["method", "handler", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "yaver_http_requests_in_flight",
+    "API requests currently being handled",
+)
+
+def statement_kind(sql: str) -> str:
+    match = STATEMENT_KIND.match(sql)
+    kind = match.group(1).upper() if match else ""
+    return kind if kind in STATEMENT_KINDS else "OTHER"
+
+@contextmanager
+def observe_query(sql: str, client: str):
+    """Time a MindsDB statement; `client` is "http" (async service) or "sdk" (mindsdb_sdk)"""
+    kind = statement_kind(sql)
+    in_flight = MINDSDB_QUERIES_IN_FLIGHT.labels(client)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        MINDSDB_QUERY_ERRORS.labels(kind, client).inc()
+        raise
+    finally:
+        MINDSDB_QUERY_SECONDS.labels(kind, client).observe(time.perf_counter() - start)
+        in_flight.dec()
+
+@contextmanager
+def observe_connection(client: str, strategy: int):
+    """Count a connection attempt and whether it failed"""
+    MINDSDB_CONNECTION_ATTEMPTS.labels(client, str(strategy)).inc()
+    try:
+        yield
+    except BaseException:
+        MINDSDB_CONNECTION_FAILURES.labels(client, str(strategy)).inc()
+        raise
+
+def handler_label(scope) -> str:
+    """
+    Name of the endpoint that served a request, e.g. "agents.get_agents".
+    Unlike the raw path this has bounded cardinality, and unlike the route
+    template it doesn't depend on how routers were included.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    return f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per endpoint and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched endpoint in the shared scope
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], handler_label(scope), status
+            ).observe(time.perf_counter() - start)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+def render_metrics():
+    """Current metrics in the Prometheus text format, with its content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,6 +1,54 @@
 import os
-from mindsdb_sdk import connect
+import logging
+import requests
 from functools import lru_cache
+from typing import Dict
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.metrics import observe_connection
+
+logger = logging.getLogger(__name__)
+
+# Credential strategies tried in order when connecting to MindsDB
+CONNECTION_STRATEGIES = [
+    ("without credentials", ()),
+    ("with empty credentials", ("", "")),
+    ("with default credentials", ("mindsdb", "mindsdb")),
+]
+
+# Errors from mindsdb_sdk calls that mean MindsDB couldn't be reached
+SDK_CONNECTION_ERRORS = (ConnectionError, requests.ConnectionError, requests.Timeout)
+
+# Databases known to exist, so ensure_database checks each one once per process
+_known_databases = set()
+
+# Host -> the credential strategy that last worked, shared by every client
+_strategies: Dict[str, int] = {}
+
+def _host_key(host: str = None) -> str:
+    return (host or os.getenv("MINDSDB_HOST", "http://mindsdb:47334")).rstrip("/")
+
+@lru_cache()
+def _circuit_breaker(host: str) -> CircuitBreaker:
+    return CircuitBreaker(host)
+
+def get_circuit_breaker(host: str = None) -> CircuitBreaker:
+    """The circuit breaker shared by every sync and async client of a MindsDB host"""
+    return _circuit_breaker(_host_key(host))
+
+def preferred_strategy(host: str = None):
+    """The credential strategy that last worked against the host, if any"""
+    return _strategies.get(_host_key(host))
+
+def remember_strategy(host: str, strategy: int):
+    _strategies[_host_key(host)] = strategy
+
+def connect(*args):
+    """
+    mindsdb_sdk.connect, imported on first use. The SDK pulls in pandas and
+    the SQL parser, which would otherwise add most of the app's import time.
+    """
+    from mindsdb_sdk import connect as sdk_connect
+    return sdk_connect(*args)
 
 @lru_cache()
 def get_mindsdb_client():
@@ -11,8 +59,72 @@ def get_mindsdb_client():
     host = os.getenv("MINDSDB_HOST", "cloud.mindsdb.com")
     user = os.getenv("MINDSDB_USER")
     password = os.getenv("MINDSDB_PASSWORD")
-    
+
     if not user or not password:
         raise ValueError("MindsDB credentials not found in environment variables")
-    
-    return connect(host, user, password) 
\ No newline at end of file
+
+    with observe_connection("sdk", "env"):
+        return connect(host, user, password)
+
+def connect_with_strategy(host: str, strategy: int):
+    """Connect to MindsDB using a single credential strategy"""
+    description, credentials = CONNECTION_STRATEGIES[strategy]
+    logger.info(f"Attempting connection {description}")
+    with observe_connection("sdk", strategy):
+        return connect(host, *credentials)
+
+def connect_with_fallback(host: str, preferred: int = None):
+    """
+    Connect to MindsDB, trying the preferred credential strategy (by default
+    the one that last worked) first. Returns the client and the index of the
+    strategy that worked. Fails fast with CircuitOpenError while MindsDB is down.
+    """
+    if preferred is None:
+        preferred = preferred_strategy(host)
+    order = list(range(len(CONNECTION_STRATEGIES)))
+    if preferred is not None:
+        order.remove(preferred)
+        order.insert(0, preferred)
+
+    # The SDK may connect lazily, so only queries count as successes; failing
+    # every strategy counts as one failure, whatever the error
+    breaker = get_circuit_breaker(host)
+    breaker.check()
+    for position, strategy in enumerate(order):
+        try:
+            client = connect_with_strategy(host, strategy)
+            logger.info("Connected to MindsDB successfully")
+            remember_strategy(host, strategy)
+            return client, strategy
+        except Exception as e:
+            logger.warning(f"Connection attempt {position+1} failed: {str(e)}")
+            if position == len(order) - 1:  # Last attempt
+                logger.error("All connection attempts to MindsDB failed")
+                breaker.record_failure()
+                raise
+
+def ensure_database(client, name: str = "marketing_agents") -> bool:
+    """Create the project database if it doesn't exist. Returns True if it was created."""
+    if name in _known_databases:
+        return False
+    with get_circuit_breaker().call(SDK_CONNECTION_ERRORS):
+        result = client.query("SHOW DATABASES;").fetch()
+
+    database_exists = False
+    if result is not None:
+        for column in ("Database", "database", "NAME", "name"):
+            if column in result.columns:
+                database_exists = name in set(result[column])
+                break
+        else:
+            database_exists = name in str(result)
+
+    if database_exists:
+        logger.info(f"Found existing {name} database")
+        _known_databases.add(name)
+        return False
+
+    logger.info(f"Creating {name} database")
+    client.query(f"CREATE DATABASE {name};").fetch()
+    _known_databases.add(name)
+    return True
@@ -0,0 +1,174 @@
+import os
+import asyncio
+import logging
+import httpx
+from typing import Any, Dict, List, Optional
+from app.config import MINDSDB_HTTP_MAX_CONNECTIONS, MINDSDB_HTTP_TIMEOUT
+from app.utils.mindsdb_client import CONNECTION_STRATEGIES, get_circuit_breaker, preferred_strategy, remember_strategy
+from app.utils.metrics import observe_connection, observe_query
+from app.utils.tracing import trace_query
+
+logger = logging.getLogger(__name__)
+
+class MindsDBQueryError(RuntimeError):
+    """Raised when MindsDB rejects a SQL statement"""
+
+class MindsDBConnectionError(ConnectionError):
+    """Raised when MindsDB can't be reached or authenticated against"""
+
+class AsyncMindsDBClient:
+    """
+    Async client for MindsDB's HTTP SQL API.
+
+    One instance is owned by the app and shares a pooled httpx.AsyncClient
+    across all requests. The credential strategy that works is resolved once
+    and reused; a 401 triggers a single re-login. Whether the last request
+    reached MindsDB is tracked for the readiness probe, and calls fail fast
+    while the host's shared circuit breaker is open.
+    """
+
+    def __init__(
+        self,
+        host: str = None,
+        max_connections: int = MINDSDB_HTTP_MAX_CONNECTIONS,
+        timeout: float = MINDSDB_HTTP_TIMEOUT,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        self.host = (host or os.getenv("MINDSDB_HOST", "http://mindsdb:47334")).rstrip("/")
+        self.strategy: Optional[int] = None
+        self.last_error: Optional[str] = None  # Set while MindsDB is unreachable
+        self._databases = set()  # Databases known to exist
+        self._connect_lock = asyncio.Lock()
+        self.breaker = get_circuit_breaker(self.host)
+        self._http = httpx.AsyncClient(
+            base_url=self.host,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def connect(self, preferred: int = None) -> int:
+        """Find a credential strategy that MindsDB accepts and remember it"""
+        if preferred is None:
+            preferred = preferred_strategy(self.host)
+        order = list(range(len(CONNECTION_STRATEGIES)))
+        if preferred is not None:
+            order.remove(preferred)
+            order.insert(0, preferred)
+
+        for position, strategy in enumerate(order):
+            description, credentials = CONNECTION_STRATEGIES[strategy]
+            logger.info(f"Attempting connection {description}")
+            try:
+                with observe_connection("http", strategy):
+                    if credentials:
+                        await self._login(*credentials)
+                    response = await self._post_query("SHOW DATABASES;", "mindsdb")
+                    if response.status_code == 401:
+                        raise MindsDBConnectionError("MindsDB rejected the credentials")
+                    response.raise_for_status()
+                self.strategy = strategy
+                remember_strategy(self.host, strategy)
+                logger.info("Connected to MindsDB successfully")
+                return strategy
+            except (httpx.HTTPError, MindsDBConnectionError) as e:
+                logger.warning(f"Connection attempt {position+1} failed: {str(e)}")
+
+        logger.error("All connection attempts to MindsDB failed")
+        self.last_error = f"Could not connect to MindsDB at {self.host}"
+        raise MindsDBConnectionError(self.last_error)
+
+    @property
+    def connected(self) -> bool:
+        """Connected, and the last request got an answer"""
+        return self.strategy is not None and self.last_error is None
+
+    async def _ensure_connected(self):
+        if self.strategy is not None:
+            return
+        async with self._connect_lock:
+            if self.strategy is None:
+                await self.connect()
+
+    async def _login(self, username: str, password: str):
+        response = await self._http.post("/api/login", json={"username": username, "password": password})
+
+        # Fall back to the cloud login endpoint
+        if response.status_code in (404, 405):
+            response = await self._http.post("/cloud/login", json={"email": username, "password": password})
+
+        if response.status_code >= 400:
+            raise MindsDBConnectionError(f"Login failed: {response.status_code} {response.text}")
+
+        # Newer MindsDB versions authenticate with a bearer token
+        if "application/json" in response.headers.get("content-type", ""):
+            body = response.json()
+            if isinstance(body, dict) and "token" in body:
+                self._http.headers["Authorization"] = f"Bearer {body['token']}"
+
+    async def _post_query(self, sql: str, database: str) -> httpx.Response:
+        try:
+            response = await self._http.post("/api/sql/query", json={"query": sql, "context": {"db": database}})
+        except httpx.TransportError as e:
+            self.last_error = f"MindsDB is unavailable: {str(e)}"
+            raise MindsDBConnectionError(self.last_error) from e
+        self.last_error = None
+        return response
+
+    async def query(self, sql: str, database: str = "mindsdb") -> List[Dict[str, Any]]:
+        """
+        Execute a SQL statement and return the result rows as dicts.
+        Column names are lowercased; statements without a result set return [].
+        """
+        with self.breaker.call((MindsDBConnectionError,)):
+            return await self._query(sql, database)
+
+    async def _query(self, sql: str, database: str) -> List[Dict[str, Any]]:
+        await self._ensure_connected()
+
+        with observe_query(sql, "http"), trace_query(sql, "http") as span:
+            response = await self._post_query(sql, database)
+            if response.status_code == 401 and self.strategy is not None:
+                # Session expired - log in again once
+                _, credentials = CONNECTION_STRATEGIES[self.strategy]
+                if credentials:
+                    await self._login(*credentials)
+                response = await self._post_query(sql, database)
+
+            if response.status_code == 401:
+                raise MindsDBConnectionError("MindsDB rejected the credentials")
+
+            try:
+                data = response.json()
+            except ValueError:
+                raise MindsDBConnectionError(f"MindsDB returned {response.status_code}: {response.text}")
+
+            if data.get("type") == "error":
+                raise MindsDBQueryError(data.get("error_message") or "Unknown MindsDB error")
+            if data.get("type") != "table":
+                return []
+
+            columns = [column.lower() for column in data["column_names"]]
+            span.rows = len(data["data"])
+            return [dict(zip(columns, row)) for row in data["data"]]
+
+    async def ensure_database(self, name: str = "marketing_agents") -> bool:
+        """Create the project database if it doesn't exist. Returns True if it was created."""
+        if name in self._databases:
+            return False
+        rows = await self.query("SHOW DATABASES;")
+        if any(name in (row.get("database"), row.get("name")) for row in rows):
+            logger.info(f"Found existing {name} database")
+            self._databases.add(name)
+            return False
+
+        logger.info(f"Creating {name} database")
+        await self.query(f"CREATE DATABASE {name};")
+        self._databases.add(name)
+        return True
+
+    async def close(self):
+        await self._http.aclose()
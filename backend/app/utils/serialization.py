@@ -0,0 +1,46 @@
+import gc
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, List, Sequence
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+# Dict keys that aren't strings (e.g. score buckets) and NumPy values are common in our payloads
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+@lru_cache(maxsize=None)
+def type_adapter(model_type: Any) -> TypeAdapter:
+    """A TypeAdapter per type, built once; building one compiles its validator and serializer"""
+    return TypeAdapter(model_type)
+
+# Fast JSON decoding of bytes or str; raises orjson.JSONDecodeError, a ValueError
+loads = orjson.loads
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode plain data with orjson; values it doesn't know are rendered with str()"""
+    return orjson.dumps(content, default=str, option=ORJSON_OPTIONS)
+
+def dump_models(content: Any, model_type: Any) -> bytes:
+    """Serialize models (or lists of them) in one pass, without validating them again"""
+    return type_adapter(model_type).dump_json(content)
+
+def dump_model_list(items: Sequence[BaseModel]) -> bytes:
+    """Serialize a list of models of one type"""
+    if not items:
+        return b"[]"
+    return dump_models(items, List[type(items[0])])
+
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector while building a large batch of
+    objects; collection passes over the growing object graph cost more than
+    building it. Nothing built from JSON or validated models forms cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
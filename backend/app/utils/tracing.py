@@ -0,0 +1,167 @@
+import re
+import json
+import time
+import random
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from app.config import TRACE_SAMPLE_RATE, TRACE_DEBUG_HEADER, TRACE_SLOW_QUERY_SECONDS, TRACE_MAX_STATEMENT_LENGTH
+
+# Per-request tracing of the SQL statements sent to MindsDB. A sampled
+# request collects one span per statement and is logged as a single JSON
+# line when it finishes; unsampled requests only pay for a context lookup.
+
+logger = logging.getLogger("app.trace")
+
+# Request header that forces a trace and returns its summary in TRACE_RESPONSE_HEADER
+TRACE_REQUEST_HEADER = b"x-debug-trace"
+TRACE_RESPONSE_HEADER = b"x-query-trace"
+
+# Secrets in CREATE ENGINE parameters (JSON) and USING clauses (key = 'value')
+SECRET_JSON = re.compile(r'("[\w-]*(?:api_key|password|secret|token)[\w-]*"\s*:\s*)"(?:[^"\\]|\\.)*"', re.IGNORECASE)
+SECRET_OPTION = re.compile(r"(\b\w*(?:api_key|password|secret|token)\w*\s*=\s*)'(?:[^']|'')*'", re.IGNORECASE)
+STATEMENT_KIND = re.compile(r"^\s*(\w+)")
+
+def redact(sql: str) -> str:
+    """Mask credentials and shorten a statement for logging"""
+    sql = SECRET_OPTION.sub(r"\1'***'", SECRET_JSON.sub(r'\1"***"', sql))
+    sql = " ".join(sql.split())
+    if len(sql) > TRACE_MAX_STATEMENT_LENGTH:
+        sql = sql[:TRACE_MAX_STATEMENT_LENGTH] + "..."
+    return sql
+
+class QuerySpan:
+    __slots__ = ("sql", "client", "started", "duration", "rows", "error")
+
+    def __init__(self, sql: str, client: str):
+        self.sql = sql
+        self.client = client
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.rows: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def kind(self) -> str:
+        match = STATEMENT_KIND.match(self.sql)
+        return match.group(1).upper() if match else "OTHER"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "client": self.client,
+            "statement": redact(self.sql),
+            "duration_ms": round(self.duration * 1000, 2),
+            "rows": self.rows,
+            "error": self.error,
+        }
+
+class RequestTrace:
+    """The statements issued while handling one request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.spans: List[QuerySpan] = []
+
+    def summary(self) -> str:
+        """Compact, header-safe summary: count, total time and time per statement kind"""
+        by_kind: Dict[str, List[float]] = {}
+        for span in self.spans:
+            by_kind.setdefault(span.kind, []).append(span.duration)
+        total = sum(span.duration for span in self.spans) * 1000
+        parts = [f"queries={len(self.spans)}", f"query_ms={total:.1f}"]
+        parts += [f"{kind}={len(durations)}x{sum(durations) * 1000:.1f}ms" for kind, durations in sorted(by_kind.items())]
+        return "; ".join(parts)
+
+    def to_dict(self, status: Optional[int]) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "summary": self.summary(),
+            "queries": [span.to_dict() for span in self.spans],
+        }
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("query_trace", default=None)
+
+@contextmanager
+def trace_query(sql: str, client: str):
+    """
+    Record a statement on the current request's trace, if it's sampled.
+    Callers set `span.rows` once the result is known.
+    """
+    trace = _current_trace.get()
+    span = QuerySpan(sql, client)
+    try:
+        yield span
+    except Exception as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.duration = time.perf_counter() - span.started
+        if trace is not None:
+            trace.spans.append(span)
+        if span.duration >= TRACE_SLOW_QUERY_SECONDS:
+            logger.warning(f"Slow MindsDB query ({span.duration:.2f}s): {redact(sql)}")
+
+def bind(call: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """
+    Attach the current trace to a call that will run in another task, such as
+    an evaluation scheduler worker, so its statements land on the right request.
+    """
+    trace = _current_trace.get()
+
+    async def traced():
+        token = _current_trace.set(trace)
+        try:
+            return await call()
+        finally:
+            _current_trace.reset(token)
+    return traced
+
+class TracingMiddleware:
+    """
+    Samples requests at TRACE_SAMPLE_RATE, or always when the client sends
+    X-Debug-Trace and TRACE_DEBUG_HEADER is enabled. Debug requests get an
+    X-Query-Trace summary header covering the statements issued before the
+    response started; the logged trace covers the whole request.
+    """
+
+    def __init__(self, app, sample_rate: float = TRACE_SAMPLE_RATE, debug_header: bool = TRACE_DEBUG_HEADER):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.debug_header = debug_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = self.debug_header and any(name == TRACE_REQUEST_HEADER for name, _ in scope["headers"])
+        if not debug and not (self.sample_rate and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope["method"], scope["path"])
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if debug:
+                    headers = list(message.get("headers", []))
+                    headers.append((TRACE_RESPONSE_HEADER, trace.summary().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            logger.info(json.dumps(trace.to_dict(status)))
@@ -0,0 +1,119 @@
+"""
+Agent row decoding benchmark.
+
+Turns rows shaped like the agents table (JSON-encoded list columns) into
+Agent models, comparing the per-row path (json.loads per column, then
+Agent(**row)) with the bulk path (orjson plus one cached TypeAdapter pass),
+and reports rows/sec. Each run is appended to a JSONL results file tagged
+with the git commit, like the endpoint benchmark.
+
+    cd backend
+    python -m benchmarks.agent_rows --rows 10000,100000 --invalid-rate 0.01
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from benchmarks.endpoints import BACKEND_DIR, git_commit
+
+DEFAULT_RESULTS = os.path.join(BACKEND_DIR, "benchmarks", "results", "agent_rows.jsonl")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000", help="Comma-separated result set sizes")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Share of rows with an invalid value")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best one is reported")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSONL file results are appended to")
+    parser.add_argument("--no-save", action="store_true", help="Don't append this run to the results file")
+    return parser.parse_args(argv)
+
+def make_rows(size: int, invalid_rate: float, seed: int) -> List[Dict[str, Any]]:
+    """Rows as SELECT * FROM the agents table returns them"""
+    from app.models.population import CategoricalSpec, MultiLabelSpec, PopulationSpec
+    from app.services.mindsdb_queries import AGENT_JSON_COLUMNS, format_name
+    from app.services.population import generate_population
+
+    agents = generate_population(PopulationSpec(
+        size=size, seed=seed, ml_engine_id="benchmark",
+        location=CategoricalSpec(weights={"Istanbul": 3, "Ankara": 2, "Izmir": 1}),
+        interests=MultiLabelSpec(weights={"tech": 3, "sports": 2, "travel": 1, "food": 1}),
+    ))
+    rng = random.Random(seed)
+    created_at = datetime.now().isoformat()
+    rows = []
+    for agent in agents:
+        row = agent.model_dump()
+        row.update(id=format_name(agent.name), created_at=created_at)
+        for column in AGENT_JSON_COLUMNS:
+            if row.get(column) is not None:
+                row[column] = json.dumps(row[column], default=str)
+        if rng.random() < invalid_rate:
+            row["brand_loyalty"] = 42
+        rows.append(row)
+    return rows
+
+def per_row(rows: List[Dict[str, Any]]) -> int:
+    """The previous path: json.loads per column and one Agent(**row) per row"""
+    from app.models.agent import Agent
+    from app.services.mindsdb_queries import AGENT_JSON_COLUMNS
+
+    agents = []
+    for row in rows:
+        data = dict(row)
+        for column in AGENT_JSON_COLUMNS:
+            if isinstance(data.get(column), str):
+                data[column] = json.loads(data[column])
+        try:
+            agents.append(Agent(**data))
+        except ValueError:
+            pass
+    return len(agents)
+
+def bulk(rows: List[Dict[str, Any]]) -> int:
+    from app.services.mindsdb_queries import agents_from_rows
+    agents, _ = agents_from_rows(rows)
+    return len(agents)
+
+def best_time(function: Callable, rows: List[Dict[str, Any]], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(rows)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, BACKEND_DIR)
+
+    # Build the cached adapter outside the measurements
+    bulk(make_rows(1, 0.0, args.seed))
+
+    results = []
+    for size in [int(size) for size in args.rows.split(",")]:
+        rows = make_rows(size, args.invalid_rate, args.seed)
+        valid = bulk(rows)
+        for name, function in (("per_row", per_row), ("bulk", bulk)):
+            elapsed = best_time(function, rows, args.repeat)
+            results.append({"path": name, "rows": size, "valid": valid, "seconds": elapsed, "rows_per_second": size / elapsed})
+            print(f"{name:<8} {size:>8} rows  {size / elapsed:>12,.0f} rows/s  ({valid} valid)")
+
+    current = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {"invalid_rate": args.invalid_rate, "seed": args.seed, "repeat": args.repeat},
+        "results": results,
+    }
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, "a") as f:
+            f.write(json.dumps(current) + "\n")
+        print(f"\nResults appended to {args.results}")
+
+if __name__ == "__main__":
+    main()
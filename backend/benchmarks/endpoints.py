@@ -0,0 +1,226 @@
+"""
+Endpoint load benchmark against the in-process fake MindsDB.
+
+Drives the FastAPI app through an ASGI transport (no network, no MindsDB),
+so the numbers are the backend's own overhead plus the configured fake
+latency. Each run is appended to a JSONL results file tagged with the git
+commit, and --compare prints the change against the latest run of another
+commit with the same configuration.
+
+    cd backend
+    python -m benchmarks.endpoints --concurrency 1,8,32 --requests 200
+    python -m benchmarks.endpoints --latency 0.005 --predict-latency 0.2 --compare
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS = os.path.join(BACKEND_DIR, "benchmarks", "results", "endpoints.jsonl")
+FAKE_MINDSDB_HOST = "http://fake-mindsdb"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--agents", type=int, default=500, help="Size of the seeded audience")
+    parser.add_argument("--endpoints", default=None, help="Comma-separated scenario names to run (default: all)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake MindsDB latency per statement (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform fake latency (s)")
+    parser.add_argument("--predict-latency", type=float, default=0.0, help="Extra fake latency per prediction statement (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of fake MindsDB calls that return 503")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSONL file results are appended to")
+    parser.add_argument("--compare", action="store_true", help="Compare with the latest run of another commit")
+    parser.add_argument("--no-save", action="store_true", help="Don't append this run to the results file")
+    return parser.parse_args(argv)
+
+def fake_host(args) -> str:
+    params = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "predict_latency": args.predict_latency,
+        "failure_rate": args.failure_rate,
+        "seed": args.seed,
+    }
+    return "fake://?" + urlencode(params)
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=BACKEND_DIR, capture_output=True, text=True).stdout
+        return commit + ("-dirty" if dirty.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+# name -> (method, path, JSON body)
+Scenario = Tuple[str, str, Optional[Dict[str, Any]]]
+
+def scenarios(campaign_id: str) -> Dict[str, Scenario]:
+    return {
+        "list_agents": ("GET", "/api/agents/", None),
+        "list_agents_page": ("GET", "/api/agents/?limit=50&fields=name,location,price_sensitivity&min_price_sensitivity=5", None),
+        "list_campaigns": ("GET", "/api/campaigns/", None),
+        "get_campaign": ("GET", f"/api/campaigns/{campaign_id}", None),
+        "list_ml_engines": ("GET", "/api/ml-engines/", None),
+        "evaluate_cached": ("POST", "/api/evaluations/", {"campaign_id": campaign_id}),
+        "evaluate_fresh": ("POST", "/api/evaluations/", {"campaign_id": campaign_id, "bypass_cache": True}),
+    }
+
+async def seed(client, args) -> str:
+    """Create an engine without rate limits, an audience and a campaign"""
+    response = await client.post("/api/ml-engines/", json={
+        "name": "bench_engine", "provider": "openai", "api_key": "bench",
+        "max_concurrency": 64, "requests_per_minute": 10_000_000,
+    })
+    response.raise_for_status()
+    response = await client.post("/api/agents/generate?create=true", json={
+        "size": args.agents, "seed": args.seed, "ml_engine_id": "bench_engine",
+        "location": {"weights": {"Istanbul": 3, "Ankara": 2, "Izmir": 1}},
+        "interests": {"weights": {"tech": 3, "sports": 2, "travel": 1, "food": 1}},
+        "price_sensitivity": {"distribution": "beta", "a": 5, "b": 2},
+    })
+    response.raise_for_status()
+    response = await client.post("/api/campaigns/", json={
+        "name": "bench campaign", "description": "Benchmark campaign", "target_audience": "everyone",
+        "budget": "1000", "marketing_channel": "email", "message_type": "promotional", "content": "Buy now",
+    })
+    response.raise_for_status()
+    return response.json()["id"]
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int) -> Dict[str, Any]:
+    method, path, body = scenario
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": requests / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+async def run(args) -> List[Dict[str, Any]]:
+    # Imported here so the environment above is in place when the app reads its config
+    import httpx
+    from app.main import app
+    from app.utils.mindsdb_http import AsyncMindsDBClient
+    from benchmarks.fake_mindsdb import FakeMindsDB
+
+    # Startup keeps a client that's already on app.state; this one talks to the fake through its transport
+    fake = FakeMindsDB.from_url(fake_host(args))
+    app.state.mindsdb = AsyncMindsDBClient(FAKE_MINDSDB_HOST, transport=fake.transport())
+
+    # Per-request INFO logging would dominate the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            campaign_id = await seed(client, args)
+            selected = scenarios(campaign_id)
+            if args.endpoints:
+                selected = {name: selected[name] for name in args.endpoints.split(",")}
+            for name, scenario in selected.items():
+                # Warm caches and connections so every level measures steady state
+                await client.request(scenario[0], scenario[1], json=scenario[2])
+                for concurrency in levels:
+                    stats = await run_scenario(client, scenario, args.requests, concurrency)
+                    results.append({"endpoint": name, "concurrency": concurrency, **stats})
+                    print(
+                        f"{name:<18} c={concurrency:<4} {stats['throughput']:>9.1f} req/s  "
+                        f"p50 {stats['p50_ms']:>8.2f} ms  p95 {stats['p95_ms']:>8.2f} ms  "
+                        f"p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}"
+                    )
+    return results
+
+def load_runs(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(current: Dict[str, Any], runs: List[Dict[str, Any]]):
+    """Print throughput and p95 changes against the latest comparable run of another commit"""
+    baseline = next(
+        (run for run in reversed(runs) if run["commit"] != current["commit"] and run["config"] == current["config"]),
+        None,
+    )
+    if baseline is None:
+        print("No earlier run with the same configuration to compare with")
+        return
+
+    print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+    previous = {(result["endpoint"], result["concurrency"]): result for result in baseline["results"]}
+    for result in current["results"]:
+        before = previous.get((result["endpoint"], result["concurrency"]))
+        if before is None:
+            continue
+        throughput = (result["throughput"] / before["throughput"] - 1) * 100
+        p95 = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        print(f"{result['endpoint']:<18} c={result['concurrency']:<4} throughput {throughput:+6.1f}%  p95 {p95:+6.1f}%")
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Point the app at the fake and keep its caches and engine catalog out of the real data directories
+    os.environ["MINDSDB_HOST"] = FAKE_MINDSDB_HOST
+    os.environ["YAVER_DATA_DIR"] = tempfile.mkdtemp(prefix="yaver-bench-")
+    os.environ["ENGINES_DIR"] = os.path.join(os.environ["YAVER_DATA_DIR"], "engines")
+    sys.path.insert(0, BACKEND_DIR)
+
+    results = asyncio.run(run(args))
+    current = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "requests": args.requests, "agents": args.agents, "mindsdb": fake_host(args),
+        },
+        "results": results,
+    }
+
+    runs = load_runs(args.results)
+    if args.compare:
+        compare(current, runs)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, "a") as f:
+            f.write(json.dumps(current) + "\n")
+        print(f"\nResults appended to {args.results}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Per-engine latency and throughput benchmark.
+
+Replays a fixed corpus of (agent prompt, campaign) pairs against ML engines at
+several concurrency levels and records time to first token, latency
+percentiles, tokens/sec, error rate and how many responses could be parsed
+into a score. Runs are appended to a JSONL results file tagged with the git
+commit, like the endpoint benchmark.
+
+Engines are the ones in the engine catalog (or --engines), queried through a
+benchmark model per engine in MindsDB, and/or local stub engines with
+configurable latency distributions, so the harness runs offline:
+
+    cd backend
+    python -m benchmarks.engines --concurrency 1,4,16
+    python -m benchmarks.engines --engines openai_engine,claude --corpus-size 50
+    python -m benchmarks.engines --stub fast,ttft=lognormal:0.3:0.4,tps=normal:80:10 \\
+        --stub slow,ttft=uniform:1:2,tps=const:25,errors=0.02
+
+Distributions are const:VALUE, uniform:LOW:HIGH, normal:MEAN:STD,
+lognormal:MEDIAN:SIGMA and exp:MEAN (seconds for ttft, tokens/sec for tps).
+MindsDB's SQL API doesn't stream, so for MindsDB engines the first token
+arrives with the whole response and TTFT equals total latency.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from benchmarks.endpoints import BACKEND_DIR, git_commit
+
+DEFAULT_RESULTS = os.path.join(BACKEND_DIR, "benchmarks", "results", "engines.jsonl")
+
+# Campaigns the corpus pairs agents with; fixed so runs are comparable
+CAMPAIGNS = [
+    {
+        "name": "summer sale", "marketing_channel": "email", "message_type": "promotional",
+        "description": "Seasonal discount on the whole catalogue",
+        "content": "Summer sale: 30% off everything until Sunday. Free shipping on orders over $50.",
+    },
+    {
+        "name": "new phone launch", "marketing_channel": "social_media", "message_type": "informational",
+        "description": "Launch of a mid-range smartphone",
+        "content": "Meet the X5: two-day battery, a 50MP camera and 5G, from $399. Pre-order today.",
+    },
+    {
+        "name": "charity run", "marketing_channel": "sms", "message_type": "emotional",
+        "description": "Community fundraiser for the children's hospital",
+        "content": "Every step counts. Join our 5K on May 12 and help us raise $100,000 for sick kids.",
+    },
+    {
+        "name": "banking app", "marketing_channel": "push_notification", "message_type": "promotional",
+        "description": "Cashback offer for new mobile banking users",
+        "content": "Open an account in 5 minutes and get 5% cashback on groceries for three months.",
+    },
+]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", default=None, help="Comma-separated engine ids (default: all catalog engines)")
+    parser.add_argument("--stub", action="append", default=[], help="Stub engine: NAME,ttft=DIST,tps=DIST[,errors=RATE]")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--corpus-size", type=int, default=100, help="Prompt and campaign pairs replayed per level")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before a request counts as failed")
+    parser.add_argument("--mindsdb-host", default=None, help="MindsDB URL (default: MINDSDB_HOST)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSONL file results are appended to")
+    parser.add_argument("--no-save", action="store_true", help="Don't append this run to the results file")
+    return parser.parse_args(argv)
+
+def build_corpus(size: int, seed: int) -> List[Dict[str, str]]:
+    """Agent prompts from a seeded population, each rendered with one of CAMPAIGNS"""
+    from app.models.population import CategoricalSpec, MultiLabelSpec, NumericSpec, PopulationSpec
+    from app.services.population import generate_population
+    from app.services.prompts import generate_agent_prompt
+
+    agents = generate_population(PopulationSpec(
+        size=size, seed=seed, ml_engine_id="benchmark",
+        age=NumericSpec(distribution="normal", low=18, high=75, mean=38, std=12),
+        gender=CategoricalSpec(weights={"MALE": 1, "FEMALE": 1}),
+        occupation=CategoricalSpec(weights={"engineer": 2, "teacher": 2, "nurse": 1, "student": 2, "retired": 1}),
+        income_level=CategoricalSpec(weights={"low": 1, "medium": 2, "high": 1}),
+        location=CategoricalSpec(weights={"Istanbul": 3, "Ankara": 2, "Izmir": 1}),
+        interests=MultiLabelSpec(weights={"tech": 3, "sports": 2, "travel": 1, "food": 1, "fashion": 1}),
+        personality_traits=MultiLabelSpec(weights={"curious": 1, "cautious": 1, "impulsive": 1, "frugal": 1}),
+    ))
+    corpus = []
+    for index, agent in enumerate(agents):
+        campaign = CAMPAIGNS[index % len(CAMPAIGNS)]
+        prompt = generate_agent_prompt(agent)
+        for field, value in campaign.items():
+            prompt = prompt.replace("{{" + field + "}}", value)
+        corpus.append({"agent": agent.name, "campaign": campaign["name"], "prompt": prompt})
+    return corpus
+
+def corpus_hash(corpus: List[Dict[str, str]]) -> str:
+    digest = hashlib.sha1()
+    for pair in corpus:
+        digest.update(pair["prompt"].encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """A sampler for a distribution spec such as lognormal:0.3:0.5"""
+    kind, *values = spec.split(":")
+    try:
+        params = [float(value) for value in values]
+        if kind == "const" and len(params) == 1:
+            return lambda rng: params[0]
+        if kind == "uniform" and len(params) == 2:
+            return lambda rng: rng.uniform(*params)
+        if kind == "normal" and len(params) == 2:
+            return lambda rng: max(rng.gauss(*params), 0.0)
+        if kind == "lognormal" and len(params) == 2:
+            return lambda rng: params[0] * np.exp(rng.gauss(0, params[1]))
+        if kind == "exp" and len(params) == 1:
+            return lambda rng: rng.expovariate(1 / params[0])
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"Invalid distribution: {spec}")
+
+class StubEngine:
+    """
+    Local stand-in for an LLM provider: waits a sampled time to first token,
+    then streams a scored JSON answer at a sampled tokens/sec rate.
+    """
+
+    streaming = True
+
+    def __init__(self, name: str, ttft: Callable, tps: Callable, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.name = name
+        self.ttft = ttft
+        self.tps = tps
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+
+    @classmethod
+    def from_spec(cls, spec: str, seed: Optional[int] = None) -> "StubEngine":
+        name, *options = spec.split(",")
+        settings = dict(option.split("=", 1) for option in options)
+        unknown = set(settings) - {"ttft", "tps", "errors"}
+        if not name or unknown:
+            raise argparse.ArgumentTypeError(f"Invalid stub engine: {spec}")
+        return cls(
+            name,
+            parse_distribution(settings.get("ttft", "const:0.5")),
+            parse_distribution(settings.get("tps", "const:50")),
+            float(settings.get("errors", 0)),
+            seed,
+        )
+
+    async def setup(self):
+        pass
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        await asyncio.sleep(self.ttft(self.random))
+        if self.random.random() < self.error_rate:
+            raise RuntimeError("Injected stub engine failure")
+        score = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest(), 16) % 10 + 1
+        words = json.dumps({
+            "score": score, "sentiment": "positive" if score >= 7 else "neutral" if score >= 4 else "negative",
+            "reasons": ["The offer matches what I usually buy", "The message is clear and easy to act on"],
+        }).split(" ")
+        tps = max(self.tps(self.random), 1e-3)
+        # Up to 8 chunks, paced so the whole answer arrives at the sampled rate
+        size = max(len(words) // 8, 1)
+        for start in range(0, len(words), size):
+            chunk = " ".join(words[start:start + size]) + " "
+            await asyncio.sleep(_tokens(chunk) / tps)
+            yield chunk
+
+    async def close(self):
+        pass
+
+class MindsDBEngine:
+    """An ML engine in MindsDB, queried through a model whose prompt is the whole input"""
+
+    streaming = False
+
+    def __init__(self, client, engine_id: str):
+        self.client = client
+        self.name = engine_id
+        self.model = f"benchmark_{engine_id}"
+
+    async def setup(self):
+        from app.services.mindsdb_queries import PROJECT, quote
+        await self.client.ensure_database(PROJECT)
+        await self.client.query(f"""
+            CREATE OR REPLACE MODEL {PROJECT}.{self.model}
+            PREDICT response
+            USING
+                engine = {quote(self.name)},
+                prompt_template = '{{{{prompt}}}}';
+            """)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        from app.services.mindsdb_queries import PROJECT, quote
+        rows = await self.client.query(f"SELECT response FROM {PROJECT}.{self.model} WHERE prompt = {quote(prompt)};")
+        if not rows:
+            raise RuntimeError("MindsDB returned no prediction")
+        yield str(rows[0]["response"])
+
+    async def close(self):
+        from app.services.mindsdb_queries import PROJECT
+        try:
+            await self.client.query(f"DROP MODEL IF EXISTS {PROJECT}.{self.model};")
+        except Exception as e:
+            print(f"Couldn't drop {PROJECT}.{self.model}: {str(e)}")
+
+def _tokens(text: str) -> int:
+    from app.services.prompts import estimate_tokens
+    return estimate_tokens(text)
+
+async def measure(engine, prompt: str, timeout: float) -> Dict[str, Any]:
+    """One request: time to first chunk, total latency, response tokens and outcome"""
+    from app.services.response_parsing import parse_response
+
+    started = time.perf_counter()
+    first = None
+    chunks = []
+
+    async def consume():
+        nonlocal first
+        async for chunk in engine.stream(prompt):
+            if first is None:
+                first = time.perf_counter() - started
+            chunks.append(chunk)
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {str(e)}", "latency": time.perf_counter() - started}
+    response = "".join(chunks)
+    latency = time.perf_counter() - started
+    return {
+        "error": None,
+        "ttft": first if first is not None else latency,
+        "latency": latency,
+        "tokens": _tokens(response),
+        "parsed": parse_response(response).score is not None,
+    }
+
+async def run_level(engine, corpus: List[Dict[str, str]], concurrency: int, timeout: float) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(pair):
+        async with semaphore:
+            return await measure(engine, pair["prompt"], timeout)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(one(pair) for pair in corpus))
+    elapsed = time.perf_counter() - started
+
+    ok = [sample for sample in samples if sample["error"] is None]
+    errors = [sample["error"] for sample in samples if sample["error"] is not None]
+    stats = {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(samples),
+        "parsed_rate": sum(sample["parsed"] for sample in ok) / len(ok) if ok else None,
+        "throughput": len(samples) / elapsed,
+        # Response tokens across all requests per second of wall time, and per request while generating
+        "tokens_per_second": sum(sample["tokens"] for sample in ok) / elapsed,
+        "request_tokens_per_second_p50": _percentiles(
+            [sample["tokens"] / sample["latency"] for sample in ok if sample["latency"] > 0], [50]
+        )[0],
+        "sample_errors": sorted(set(errors))[:3],
+    }
+    for name in ("ttft", "latency"):
+        p50, p95, p99 = _percentiles([sample[name] * 1000 for sample in ok], [50, 95, 99])
+        stats.update({f"{name}_p50_ms": p50, f"{name}_p95_ms": p95, f"{name}_p99_ms": p99})
+    return stats
+
+def _percentiles(values: List[float], percentiles: List[float]) -> List[Optional[float]]:
+    if not values:
+        return [None] * len(percentiles)
+    return [float(value) for value in np.percentile(values, percentiles)]
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+async def run(args, engines: List[Any], corpus: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    for engine in engines:
+        try:
+            await engine.setup()
+        except Exception as e:
+            print(f"Skipping {engine.name}: setup failed: {str(e)}")
+            continue
+        try:
+            # Warm connections so every level measures steady state
+            await measure(engine, corpus[0]["prompt"], args.timeout)
+            for concurrency in levels:
+                stats = await run_level(engine, corpus, concurrency, args.timeout)
+                results.append({"engine": engine.name, "streaming": engine.streaming, "concurrency": concurrency, **stats})
+                print(
+                    f"{engine.name:<16} c={concurrency:<4} ttft p50 {_ms(stats['ttft_p50_ms'])} ms  "
+                    f"latency p50 {_ms(stats['latency_p50_ms'])} p95 {_ms(stats['latency_p95_ms'])} "
+                    f"p99 {_ms(stats['latency_p99_ms'])} ms  {stats['tokens_per_second']:>8.1f} tok/s  "
+                    f"errors {stats['error_rate']:.1%}"
+                )
+        finally:
+            await engine.close()
+    return results
+
+async def main_async(args) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    # Imported here so sys.path and the environment are in place when the app reads its config
+    from app.services.engine_catalog import EngineCatalog
+    from app.utils.mindsdb_http import AsyncMindsDBClient
+
+    corpus = build_corpus(args.corpus_size, args.seed)
+    engines: List[Any] = [StubEngine.from_spec(spec, args.seed) for spec in args.stub]
+
+    client = None
+    engine_ids = args.engines.split(",") if args.engines else None
+    if engine_ids is None and not args.stub:
+        engine_ids = [engine.id for engine in EngineCatalog().list()]
+    if engine_ids:
+        client = AsyncMindsDBClient(args.mindsdb_host)
+        engines += [MindsDBEngine(client, engine_id) for engine_id in engine_ids]
+    if not engines:
+        raise SystemExit("No engines to benchmark: create one, or pass --engines or --stub")
+
+    config = {
+        "corpus_size": len(corpus), "corpus": corpus_hash(corpus), "seed": args.seed,
+        "stubs": args.stub, "mindsdb": client.host if client is not None else None,
+    }
+    try:
+        return await run(args, engines, corpus), config
+    finally:
+        if client is not None:
+            await client.close()
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, BACKEND_DIR)
+    logging.basicConfig(level=logging.WARNING)
+
+    results, config = asyncio.run(main_async(args))
+    current = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": config,
+        "results": results,
+    }
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, "a") as f:
+            f.write(json.dumps(current) + "\n")
+        print(f"\nResults appended to {args.results}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import re
+import json
+import random
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import httpx
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Models and engines are emulated; everything else runs on SQLite, where
+# MindsDB's `project.table` names map onto attached in-memory databases
+CREATE_DATABASE = re.compile(r"^CREATE\s+(?:DATABASE|PROJECT)\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+CREATE_ENGINE = re.compile(r"^CREATE\s+(?:ML_)?ENGINE\s+(?:(\w+)\.)?(\w+)\s+FROM\s+(\w+)", re.IGNORECASE)
+CREATE_MODEL = re.compile(r"^CREATE\s+(?:OR\s+REPLACE\s+)?MODEL\s+(?:(\w+)\.)?(\w+)", re.IGNORECASE)
+DROP_MODEL = re.compile(r"^DROP\s+MODEL\s+(?:IF\s+EXISTS\s+)?(?:(\w+)\.)?(\w+)", re.IGNORECASE)
+DESCRIBE = re.compile(r"^DESCRIBE\s+(?:MODEL\s+)?(?:(\w+)\.)?(\w+)", re.IGNORECASE)
+SHOW_MODELS = re.compile(r"^SHOW\s+MODELS(?:\s+(?:FROM|IN)\s+(\w+))?", re.IGNORECASE)
+USING_OPTION = re.compile(r"(\w+)\s*=\s*('(?:[^']|'')*'|[\w.]+)", re.DOTALL)
+PREDICTION = re.compile(r"SELECT\s+'((?:[^']|'')*)'\s+AS\s+agent_id.*?JOIN\s+(\w+)\.(\w+)", re.IGNORECASE | re.DOTALL)
+MODEL_QUERY = re.compile(r"^SELECT\s+.+?\s+FROM\s+(\w+)\.(\w+)\s+WHERE\s+(.*)$", re.IGNORECASE | re.DOTALL)
+STATEMENT_KIND = re.compile(r"^\s*(\w+)")
+
+class FakeMindsDB:
+    """
+    In-process stand-in for MindsDB's HTTP SQL API, for benchmarks. Answers
+    the statements the services send with configurable latency and injected
+    failures. It is plugged in as an httpx transport:
+    AsyncMindsDBClient(host, transport=fake.transport()).
+
+    from_url builds one from its settings as a query string, e.g.
+    fake://?latency=0.02&jitter=0.01&predict_latency=0.5&failure_rate=0.01&seed=1
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        predict_latency: float = 0.0,
+        failure_rate: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency  # Seconds added to every statement
+        self.jitter = jitter  # Uniform extra latency, up to this many seconds
+        self.predict_latency = predict_latency  # Extra seconds per statement that queries models
+        self.failure_rate = failure_rate  # Share of requests answered with HTTP 503
+        self.error_rate = error_rate  # Share of statements answered with a MindsDB error
+        self.random = random.Random(seed)
+        self.databases = {"mindsdb", "information_schema"}
+        self.engines: Dict[str, str] = {}
+        self.models: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.statements: Dict[str, int] = {}
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+
+    @classmethod
+    def from_url(cls, url: str) -> "FakeMindsDB":
+        params = {key: values[-1] for key, values in parse_qs(urlparse(url).query).items()}
+        seed = params.pop("seed", None)
+        return cls(seed=int(seed) if seed is not None else None, **{key: float(value) for key, value in params.items()})
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return _FakeTransport(self)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/login"):
+            return httpx.Response(200, json={})
+        if request.url.path != "/api/sql/query":
+            return httpx.Response(404, json={"detail": "Not found"})
+
+        sql = json.loads(request.content)["query"].strip().rstrip(";").strip()
+        kind = self._kind(sql)
+        self.statements[kind] = self.statements.get(kind, 0) + 1
+
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if kind == "PREDICT":
+            delay += self.predict_latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            return httpx.Response(503, text="Injected failure")
+        if self.error_rate and self.random.random() < self.error_rate:
+            return httpx.Response(200, json={"type": "error", "error_message": "Injected error"})
+
+        try:
+            return httpx.Response(200, json=self.execute(sql))
+        except (sqlite3.Error, LookupError, ValueError) as e:
+            return httpx.Response(200, json={"type": "error", "error_message": str(e)})
+
+    def _kind(self, sql: str) -> str:
+        if PREDICTION.search(sql) or self._model_query(sql):
+            return "PREDICT"
+        match = STATEMENT_KIND.match(sql)
+        return match.group(1).upper() if match else "UNKNOWN"
+
+    def execute(self, sql: str) -> Dict[str, Any]:
+        """Run one statement and return the API response body"""
+        upper = sql.upper()
+        if upper.startswith("SHOW DATABASES") or upper.startswith("SHOW PROJECTS"):
+            return _table(["Database"], [[name] for name in sorted(self.databases)])
+        if upper.startswith("SHOW ML_ENGINES") or upper.startswith("SHOW ENGINES"):
+            return _table(["name", "handler"], [[name, handler] for name, handler in self.engines.items()])
+
+        match = SHOW_MODELS.match(sql)
+        if match:
+            project = match.group(1) or "mindsdb"
+            return _table(
+                ["name", "engine", "status"],
+                [[name, model["engine"], "complete"] for (model_project, name), model in self.models.items() if model_project == project],
+            )
+
+        match = DESCRIBE.match(sql)
+        if match:
+            model = self._model(match.group(1) or "mindsdb", match.group(2))
+            return _table(["name", "status", "training_options"], [[match.group(2), "complete", json.dumps(model["options"])]])
+
+        match = CREATE_DATABASE.match(sql)
+        if match:
+            self._attach(match.group(1))
+            return {"type": "ok"}
+
+        match = CREATE_ENGINE.match(sql)
+        if match:
+            self.engines[match.group(2)] = match.group(3)
+            return {"type": "ok"}
+
+        match = CREATE_MODEL.match(sql)
+        if match:
+            return self._create_model(match.group(1) or "mindsdb", match.group(2), sql)
+
+        match = DROP_MODEL.match(sql)
+        if match:
+            self.models.pop((match.group(1) or "mindsdb", match.group(2)), None)
+            return {"type": "ok"}
+
+        if "INFORMATION_SCHEMA.MODELS" in upper:
+            return self._information_schema_models(sql)
+
+        predictions = PREDICTION.findall(sql)
+        if predictions:
+            return self._predict(predictions)
+
+        match = self._model_query(sql)
+        if match:
+            return self._predict([(match.group(3), match.group(1), match.group(2))])
+
+        return self._sqlite(sql)
+
+    def _attach(self, name: str):
+        if name not in self.databases:
+            self.db.execute(f"ATTACH DATABASE ':memory:' AS {name}")
+            self.databases.add(name)
+
+    def _model(self, project: str, name: str) -> Dict[str, Any]:
+        model = self.models.get((project, name))
+        if model is None:
+            raise LookupError(f"Model not found: {project}.{name}")
+        return model
+
+    def _create_model(self, project: str, name: str, sql: str) -> Dict[str, Any]:
+        if project not in self.databases:
+            raise LookupError(f"Database not found: {project}")
+        using = sql[sql.upper().index("USING") + len("USING"):] if "USING" in sql.upper() else ""
+        options = {}
+        for key, value in USING_OPTION.findall(using):
+            options[key] = value[1:-1].replace("''", "'") if value.startswith("'") else value
+        engine = options.get("engine")
+        if engine is not None and engine not in self.engines:
+            raise LookupError(f"Engine not found: {engine}")
+        self.models[(project, name)] = {"engine": engine, "options": {"using": options}}
+        return {"type": "ok"}
+
+    def _information_schema_models(self, sql: str) -> Dict[str, Any]:
+        match = re.search(r"project\s*=\s*'(\w+)'", sql, re.IGNORECASE)
+        rows = [
+            [name, project, model["engine"], json.dumps(model["options"])]
+            for (project, name), model in self.models.items()
+            if match is None or project == match.group(1)
+        ]
+        return _table(["name", "project", "engine", "training_options"], rows)
+
+    def _model_query(self, sql: str) -> Optional[re.Match]:
+        # SELECT ... FROM project.model WHERE ..., predicting from the WHERE values
+        match = MODEL_QUERY.match(sql)
+        if match and (match.group(1), match.group(2)) in self.models:
+            return match
+        return None
+
+    def _predict(self, predictions: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+        rows = []
+        for agent_id, project, name in predictions:
+            model = self._model(project, name)
+            # Deterministic per agent so cached and fresh runs agree
+            score = int(hashlib.sha1(agent_id.encode("utf-8")).hexdigest(), 16) % 10 + 1
+            if '"score"' in model["options"]["using"].get("prompt_template", ""):
+                sentiment = "positive" if score >= 7 else "neutral" if score >= 4 else "negative"
+                response = json.dumps({"score": score, "sentiment": sentiment, "reasons": ["Fits my interests"]})
+            else:
+                response = f"As this person I'd rate this campaign {score}/10."
+            rows.append([agent_id.replace("''", "'"), response])
+        return _table(["agent_id", "response"], rows)
+
+    def _sqlite(self, sql: str) -> Dict[str, Any]:
+        cursor = self.db.execute(sql)
+        if cursor.description is None:
+            self.db.commit()
+            return {"type": "ok"}
+        return _table([column[0] for column in cursor.description], [list(row) for row in cursor.fetchall()])
+
+def _table(columns: List[str], rows: List[List[Any]]) -> Dict[str, Any]:
+    return {"type": "table", "column_names": columns, "data": rows}
+
+class _FakeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, fake: FakeMindsDB):
+        self.fake = fake
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return await self.fake.handle(request)
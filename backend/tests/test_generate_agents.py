@@ -0,0 +1,25 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.dependencies import get_async_mindsdb_service
+from app.api.endpoints import agents
+from app.config import AGENT_IMPORT_MAX_ROWS
+
+class UnreachableService:
+    """Fails the test if the endpoint gets as far as creating agents"""
+
+    async def create_agents(self, *args, **kwargs):
+        raise AssertionError("create_agents should not be called")
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(agents.router, prefix="/api/agents")
+    app.dependency_overrides[get_async_mindsdb_service] = UnreachableService
+    return TestClient(app)
+
+def test_generate_with_create_rejects_populations_over_the_import_limit():
+    response = make_client().post(
+        "/api/agents/generate?create=true",
+        json={"size": AGENT_IMPORT_MAX_ROWS + 1, "ml_engine_id": "test_engine"},
+    )
+    assert response.status_code == 413
+    assert str(AGENT_IMPORT_MAX_ROWS) in response.json()["detail"]